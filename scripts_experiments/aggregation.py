@@ -0,0 +1,105 @@
+import numpy as np
+
+def field_matrix(statistics, settings, instances, field):
+    '''
+    collects a field of the records of several settings in a matrix
+
+    Returns a pair (values, present) of arrays of shape (len(settings), len(instances)).
+    Entry (s, i) of values contains the field of instance i for setting s and entry
+    (s, i) of present indicates whether a record for this pair exists. Values of
+    missing records are NaN.
+
+    statistics - dictionary mapping a setting to a dictionary mapping instances to their records
+    settings   - list of settings, i.e., keys of statistics
+    instances  - list of instances
+    field      - name of the field
+    '''
+
+    values = np.full((len(settings), len(instances)), np.nan)
+    present = np.zeros((len(settings), len(instances)), dtype=bool)
+
+    for (s, sett) in enumerate(settings):
+        stats = statistics[sett]
+        for (i, inst) in enumerate(instances):
+            if inst in stats:
+                values[s, i] = getattr(stats[inst], field)
+                present[s, i] = True
+
+    return values, present
+
+def shifted_geometric_means(values, shift, mask):
+    '''
+    returns the shifted geometric means exp(mean(log(x + shift))) - shift along the last axis of an array
+
+    The mean is computed via the sum of logarithms, entries whose mask is False are
+    ignored. If no entry of a row is selected, the mean of the logarithms is 0, i.e.,
+    1 - shift is returned for this row.
+
+    values - array of values
+    shift  - shift of the geometric mean
+    mask   - boolean array of the same shape as values selecting the entries to be aggregated
+    '''
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = np.where(mask, np.log(np.where(mask, values, 1.0) + shift), 0.0)
+    counts = mask.sum(axis=-1)
+
+    return np.exp(logs.sum(axis=-1) / np.maximum(counts, 1)) - shift
+
+def arithmetic_means(values, mask):
+    '''
+    returns the arithmetic means along the last axis of an array
+
+    Entries whose mask is False are ignored. If no entry of a row is selected, 0 is
+    returned for this row.
+
+    values - array of values
+    mask   - boolean array of the same shape as values selecting the entries to be aggregated
+    '''
+
+    counts = mask.sum(axis=-1)
+
+    return np.where(mask, values, 0.0).sum(axis=-1) / np.maximum(counts, 1)
+
+def counts(mask):
+    '''
+    returns the number of selected entries along the last axis of an array
+
+    mask - boolean array selecting entries
+    '''
+
+    return mask.sum(axis=-1)
+
+def performance_ratios(values, mask):
+    '''
+    returns the performance ratios of several settings, i.e., the ratio of each value to the best value of its instance
+
+    Returns an array of the same shape as values. Entry (s, i) is the ratio of the
+    value of setting s on instance i and the minimal value of instance i over all
+    settings whose mask is True. Entries whose mask is False have ratio infinity,
+    and so have all entries of instances for which no setting is selected.
+
+    values - array of shape (number of settings, number of instances) containing positive values
+    mask   - boolean array of the same shape as values selecting the entries to be compared, e.g., solved instances
+    '''
+
+    masked = np.where(mask, values, np.inf)
+    best = masked.min(axis=0)
+
+    with np.errstate(invalid="ignore"):
+        return np.where(mask, masked / best, np.inf)
+
+def fraction_at_most(values, thresholds):
+    '''
+    returns, for each row of an array and each threshold, the fraction of entries of the row that are at most the threshold
+
+    Returns an array of shape (number of rows, number of thresholds).
+
+    values     - array of shape (number of rows, number of entries)
+    thresholds - sorted array of thresholds
+    '''
+
+    ordered = np.sort(values, axis=-1)
+    counts = np.stack([np.searchsorted(row, thresholds, side="right") for row in ordered])
+
+    return counts / max(values.shape[-1], 1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+import argparse
+import concurrent.futures
+import os
+import socket
+import subprocess
+import sys
+import threading
+import records
+import run_experiments
+from log_parser import FAILED, LogParser
+
+def collect_instance(solver, instance, settingsfile, timelim, memlim):
+    '''
+    presolves an instance and returns the record containing its symmetry structures
+
+    The output of SCIP is parsed while it is printed, i.e., it is never stored. The
+    solver is killed if it exceeds the hard time or memory limit. If it has been killed
+    or terminated with a nonzero exit code, the run is marked as failed, see
+    run_experiments.failure_report; the record then contains the structures printed so far.
+
+    solver       - path to the patched SCIP executable
+    instance     - path to the instance
+    settingsfile - path to the settings file (None for default settings)
+    timelim      - time limit in seconds
+    memlim       - memory limit in megabytes
+    '''
+
+    (hardtimelim, hardmemlim) = run_experiments.hard_limits(timelim, memlim)
+    commands = run_experiments.solver_commands(instance, settingsfile, timelim, memlim, presolveonly=True)
+
+    parser = LogParser()
+    parser.feed(f"@01 {instance} ===========\n")
+
+    process = run_experiments.start_solver([solver, "-c", " ".join(commands)], hardmemlim, stderr=subprocess.DEVNULL)
+    killed = threading.Event()
+
+    def kill():
+        killed.set()
+        process.kill()
+
+    timer = threading.Timer(hardtimelim, kill)
+    timer.start()
+    try:
+        for line in process.stdout:
+            parser.feed(line.decode(errors="replace"))
+        process.wait()
+    finally:
+        timer.cancel()
+        process.stdout.close()
+
+    # presolve-only runs do not report a status, hence only killed and crashed runs are detected
+    if killed.is_set():
+        failure = f"solver killed after exceeding the hard time limit of {hardtimelim:.0f} seconds"
+    elif process.returncode != 0:
+        failure = f"solver terminated with exit code {process.returncode}"
+    else:
+        failure = None
+
+    if failure is not None:
+        for line in run_experiments.failure_report(failure, timelim).splitlines(keepends=True):
+            parser.feed(line)
+
+    return parser.feed("@04\n")
+
+def main(argv=None, prog=None):
+    '''
+    presolves the instances of the test sets given on the command line and stores their symmetry structures
+
+    argv - list of command line arguments (None if the arguments of the script shall be used)
+    prog - name of the program shown in messages (None if the name of the script shall be used)
+    '''
+
+    # create a parser for arguments
+    parser = argparse.ArgumentParser(prog=prog, description='collects the symmetry structures of test sets by presolving all instances in parallel')
+    parser.add_argument('solver', metavar='solver', type=str, help='path to the patched SCIP executable')
+    parser.add_argument('--tname', metavar='tname', type=str, action='append', required=True,
+                        help='name of test set in directory testset or path to a .test file')
+    parser.add_argument('--settings', metavar='settings', type=str, default="sym_1_doublelex_1_reflection_1_simple_1",
+                        help='name of settings in directory settings, path to a .set file, or "default"')
+    parser.add_argument('--checkdir', metavar='checkdir', type=str, default=".",
+                        help='directory relative to which the paths in .test files are given')
+    parser.add_argument('--results', metavar='results', type=str, default="results", help='directory to store records')
+    parser.add_argument('--timelim', metavar='timelim', type=int, default=3600, help='time limit per instance in seconds')
+    parser.add_argument('--memlim', metavar='memlim', type=int, default=50000, help='memory limit per instance in megabytes')
+    parser.add_argument('--jobs', metavar='jobs', type=int, default=1, help='number of instances presolved in parallel')
+    parser.add_argument('--host', metavar='host', type=str, default=socket.gethostname().split('.')[0],
+                        help='name of host used in names of record files')
+    parser.add_argument('--binary', metavar='binary', type=str, default=None,
+                        help='name of binary used in names of record files (default: name of solver executable)')
+
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1:
+        parser.error("--jobs needs to be positive")
+
+    binary = os.path.basename(args.solver) if args.binary is None else args.binary
+    settingsfile = None if args.settings == "default" else run_experiments.find_file(args.settings, run_experiments.SETTINGSDIR, ".set")
+    settingsname = "default" if settingsfile is None else os.path.basename(settingsfile)[:-len(".set")]
+    os.makedirs(args.results, exist_ok=True)
+
+    # collect the jobs of all test sets
+    jobs = []
+    for tname in args.tname:
+        testfile = run_experiments.find_file(tname, run_experiments.TESTSETDIR, ".test")
+        testset = os.path.basename(testfile)[:-len(".test")]
+        for instance in run_experiments.read_testset(testfile):
+            jobs.append((testset, os.path.join(args.checkdir, instance)))
+
+    # records are kept in the order of the test sets
+    collected = {job: None for job in jobs}
+    failed = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {executor.submit(collect_instance, args.solver, instance, settingsfile, args.timelim, args.memlim):
+                   (testset, instance) for (testset, instance) in jobs}
+
+        for (cnt, future) in enumerate(concurrent.futures.as_completed(futures)):
+            (testset, instance) = futures[future]
+            try:
+                collected[testset, instance] = future.result()
+            except OSError as e:
+                print(f"[{cnt+1}/{len(jobs)}] FAILED {instance}: {e}", file=sys.stderr)
+                failed += 1
+                continue
+
+            if collected[testset, instance].status == FAILED:
+                print(f"[{cnt+1}/{len(jobs)}] presolving of {instance} failed, its record is marked as failed")
+            else:
+                print(f"[{cnt+1}/{len(jobs)}] presolved {instance}")
+
+    for tname in args.tname:
+        testset = os.path.basename(run_experiments.find_file(tname, run_experiments.TESTSETDIR, ".test"))[:-len(".test")]
+        filename = os.path.join(args.results, f"check.{testset}.{binary}.{args.host}.{settingsname}{records.RECORDS_ENDING}")
+        records.write_records([record for ((t, instance), record) in collected.items() if t == testset and record is not None],
+                              filename)
+        print(f"stored records of test set {testset} in {filename}")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
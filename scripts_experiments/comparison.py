@@ -0,0 +1,267 @@
+import argparse
+import math
+import numpy as np
+import log_discovery
+import results_cache
+from evaluate_running_times_standard import TIMESHIFT, records_to_statistics, skipped_instances, testset_name
+
+# number of bootstrap resamples drawn at once, bounds the memory needed for the resampled indices
+BOOTSTRAP_CHUNK = 1000
+
+# largest number of nonzero differences for which the exact distribution of the Wilcoxon statistic is used
+WILCOXON_EXACT = 50
+
+def shifted_logs(times, shift):
+    '''
+    returns the logarithms of shifted running times, whose means define shifted geometric means
+
+    times - array of running times
+    shift - shift of the geometric mean
+    '''
+
+    return np.log(np.asarray(times, dtype=float) + shift)
+
+def speedup_ratios(base, other, shift):
+    '''
+    returns the per-instance speedups of a setting over a base setting, i.e., (base + shift) / (other + shift)
+
+    A ratio larger than 1 means that the other setting is faster on the instance.
+
+    base  - array of running times of the base setting
+    other - array of running times of the other setting on the same instances
+    shift - shift added to all running times
+    '''
+
+    return (np.asarray(base, dtype=float) + shift) / (np.asarray(other, dtype=float) + shift)
+
+def geometric_mean_ratio(base, other, shift):
+    '''
+    returns the ratio of the shifted geometric means of two settings on the same instances
+
+    base  - array of running times of the base setting
+    other - array of running times of the other setting on the same instances
+    shift - shift of the geometric mean
+    '''
+
+    return ((math.exp(shifted_logs(base, shift).mean()) - shift)
+            / (math.exp(shifted_logs(other, shift).mean()) - shift))
+
+def bootstrap_ratio_interval(base, other, shift, nresamples=10000, confidence=0.95, seed=0):
+    '''
+    returns a bootstrap confidence interval (lower, upper) of the ratio of shifted geometric means of two settings
+
+    Instances are resampled in pairs, i.e., each resample draws instances with replacement
+    and compares both settings on the same drawn instances. Resamples are processed in
+    chunks of BOOTSTRAP_CHUNK; per chunk, the shifted geometric means of all resamples
+    are computed by a single vectorized gather and sum. The interval is given by the
+    percentiles of the ratios of all resamples.
+
+    base       - array of running times of the base setting
+    other      - array of running times of the other setting on the same instances
+    shift      - shift of the geometric mean
+    nresamples - number of bootstrap resamples
+    confidence - confidence level of the interval
+    seed       - seed of the random number generator
+    '''
+
+    logbase = shifted_logs(base, shift)
+    logother = shifted_logs(other, shift)
+    n = len(logbase)
+
+    if n == 0:
+        return math.nan, math.nan
+
+    rng = np.random.default_rng(seed)
+    ratios = np.empty(nresamples)
+    for start in range(0, nresamples, BOOTSTRAP_CHUNK):
+        size = min(BOOTSTRAP_CHUNK, nresamples - start)
+        indices = rng.integers(0, n, size=(size, n))
+        meanbase = logbase[indices].mean(axis=1)
+        meanother = logother[indices].mean(axis=1)
+        ratios[start:start + size] = (np.exp(meanbase) - shift) / (np.exp(meanother) - shift)
+
+    alpha = 1.0 - confidence
+    (lower, upper) = np.percentile(ratios, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+
+    return float(lower), float(upper)
+
+def wilcoxon_signed_rank(differences):
+    '''
+    returns the pair (statistic, p-value) of the two-sided Wilcoxon signed-rank test of paired differences
+
+    Zero differences are discarded. The statistic is the sum of the ranks of the positive
+    differences, ties receive their average rank. If at most WILCOXON_EXACT differences
+    remain and there are no ties, the p-value is computed from the exact distribution of
+    the statistic; otherwise, the normal approximation with tie and continuity correction
+    is used. If no nonzero difference remains, (0, 1) is returned.
+
+    differences - array of paired differences, e.g., of logarithms of shifted running times
+    '''
+
+    differences = np.asarray(differences, dtype=float)
+    differences = differences[differences != 0]
+    n = len(differences)
+
+    if n == 0:
+        return 0.0, 1.0
+
+    # average ranks of the absolute differences
+    absolute = np.abs(differences)
+    order = np.argsort(absolute, kind="stable")
+    (values, first, counts) = np.unique(absolute[order], return_index=True, return_counts=True)
+    ranks = np.empty(n)
+    ranks[order] = np.repeat(first + (counts + 1) / 2.0, counts)
+
+    statistic = ranks[differences > 0].sum()
+    expected = n * (n + 1) / 4.0
+
+    if n <= WILCOXON_EXACT and np.all(counts == 1):
+        # number of subsets of {1, ..., n} per sum of ranks, computed by dynamic programming
+        nsubsets = np.zeros(n * (n + 1) // 2 + 1)
+        nsubsets[0] = 1.0
+        for k in range(1, n + 1):
+            nsubsets[k:] = nsubsets[k:] + nsubsets[:-k].copy()
+        probabilities = nsubsets / 2.0 ** n
+
+        smaller = min(statistic, n * (n + 1) / 2.0 - statistic)
+        pvalue = min(1.0, 2.0 * probabilities[:int(smaller) + 1].sum())
+    else:
+        variance = n * (n + 1) * (2 * n + 1) / 24.0 - (counts ** 3 - counts).sum() / 48.0
+        z = (abs(statistic - expected) - 0.5) / math.sqrt(variance) if variance > 0 else 0.0
+        pvalue = min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2.0)))
+
+    return statistic, pvalue
+
+def compare(base, other, shift, nresamples=10000, confidence=0.95, seed=0):
+    '''
+    returns a dictionary describing the paired comparison of two settings on the same instances
+
+    The dictionary contains the number of instances, the numbers of instances on which
+    the other setting is faster or slower, the ratio of shifted geometric means (base
+    divided by other, i.e., values larger than 1 mean that the other setting is faster)
+    with its bootstrap confidence interval, the median per-instance speedup, and the
+    p-value of the Wilcoxon signed-rank test on the logarithms of the shifted times.
+
+    base       - array of running times of the base setting
+    other      - array of running times of the other setting on the same instances
+    shift      - shift of the geometric mean
+    nresamples - number of bootstrap resamples
+    confidence - confidence level of the interval
+    seed       - seed of the random number generator
+    '''
+
+    base = np.asarray(base, dtype=float)
+    other = np.asarray(other, dtype=float)
+
+    if len(base) == 0:
+        return {"n": 0, "faster": 0, "slower": 0, "ratio": math.nan, "lower": math.nan, "upper": math.nan,
+                "median": math.nan, "pvalue": math.nan}
+
+    speedups = speedup_ratios(base, other, shift)
+    (lower, upper) = bootstrap_ratio_interval(base, other, shift, nresamples, confidence, seed)
+    (statistic, pvalue) = wilcoxon_signed_rank(shifted_logs(base, shift) - shifted_logs(other, shift))
+
+    return {
+        "n": len(base),
+        "faster": int((speedups > 1).sum()),
+        "slower": int((speedups < 1).sum()),
+        "ratio": geometric_mean_ratio(base, other, shift),
+        "lower": lower,
+        "upper": upper,
+        "median": float(np.median(speedups)),
+        "pvalue": pvalue
+        }
+
+def paired_times(base, other):
+    '''
+    returns the running times (base, other) of the instances contained in both statistics, without skipped instances
+
+    base  - dictionary mapping instances to the records of the base setting
+    other - dictionary mapping instances to the records of the other setting
+    '''
+
+    instances = sorted(set(base.keys()).intersection(other.keys()).difference(skipped_instances))
+
+    return (np.array([base[inst].time for inst in instances], dtype=float),
+            np.array([other[inst].time for inst in instances], dtype=float))
+
+def display_header(base, other):
+
+    print("% generated by comparison.py")
+    print(f"% base setting: {base}")
+    print(f"% other setting: {other}")
+    print("\\begin{tabular*}{\\textwidth}{@{}l@{\\;\\;\\extracolsep{\\fill}}rrrrrrr@{}}")
+    print("  \\toprule")
+    print("  test set & \\# & faster & slower & ratio & CI & median & $p$\\\\")
+    print("  \\midrule")
+
+def display_footer():
+
+    print("  \\bottomrule")
+    print("\\end{tabular*}")
+
+def print_line(testset, result):
+
+    print("  %s & %d & %d & %d & %5.3f & [%5.3f, %5.3f] & %5.3f & %.2g\\\\" % (
+        testset, result["n"], result["faster"], result["slower"], result["ratio"],
+        result["lower"], result["upper"], result["median"], result["pvalue"]))
+
+def main(argv=None, prog=None):
+    '''
+    displays the paired comparison of two settings on the test sets given on the command line
+
+    argv - list of command line arguments (None if the arguments of the script shall be used)
+    prog - name of the program shown in messages (None if the name of the script shall be used)
+    '''
+
+    # create a parser for arguments
+    parser = argparse.ArgumentParser(prog=prog, description='compares the running times of two settings instance by instance')
+    parser.add_argument('results', metavar='results', type=str, help='directory containing results')
+    parser.add_argument('--tname', metavar='tname', type=str, action='append', required=True, help='name of test set to be added')
+    parser.add_argument('--base', metavar='base', type=str, default="sym_0_doublelex_0_reflection_0_simple_0",
+                        help='name of the base settings')
+    parser.add_argument('--other', metavar='other', type=str, default="sym_1_doublelex_1_reflection_1_simple_1",
+                        help='name of the settings compared with the base settings')
+    parser.add_argument('--timelim', metavar='timelim', type=int, default=7200, help='time limit of experiments')
+    parser.add_argument('--resamples', metavar='resamples', type=int, default=10000, help='number of bootstrap resamples')
+    parser.add_argument('--confidence', metavar='confidence', type=float, default=0.95, help='confidence level of the intervals')
+    parser.add_argument('--seed', metavar='seed', type=int, default=0, help='seed of the bootstrap resampling')
+    parser.add_argument('--cache', metavar='cache', type=str, default=None,
+                        help='SQLite file caching parsed results (default: no cache)')
+    parser.add_argument('--jobs', metavar='jobs', type=int, default=1, help='number of processes parsing results files')
+    parser.add_argument('--host', metavar='host', type=str, default=None, help='only use logs created on this host')
+    parser.add_argument('--binary', metavar='binary', type=str, default=None, help='only use logs created by this binary')
+
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs needs to be positive")
+    if args.resamples < 1:
+        parser.error("--resamples needs to be positive")
+    if not 0 < args.confidence < 1:
+        parser.error("--confidence needs to be in (0,1)")
+
+    index = log_discovery.LogIndex(args.results)
+    names = {t: dict() for t in args.tname}
+
+    try:
+        for t in args.tname:
+            for sett in (args.base, args.other):
+                names[t][sett] = index.find_logs(t, sett, args.host, args.binary)
+    except (FileNotFoundError, ValueError) as e:
+        parser.error(str(e))
+
+    # parse all files at once, possibly in parallel
+    records = results_cache.load_records([name for t in names for sett in names[t] for name in names[t][sett]],
+                                         args.timelim, args.cache, args.jobs)
+
+    display_header(args.base, args.other)
+    for t in args.tname:
+        statistics = {sett: records_to_statistics(record for name in names[t][sett] for record in records[name])
+                      for sett in names[t]}
+        (base, other) = paired_times(statistics[args.base], statistics[args.other])
+        result = compare(base, other, TIMESHIFT, args.resamples, args.confidence, args.seed)
+        print_line(testset_name.get(t, t), result)
+    display_footer()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import importlib
+import os
+import sys
+
+# subcommands, the modules implementing them, and their descriptions
+COMMANDS = {
+    "nonlinear": ("evaluate_running_times_nonlinear", "tables of running times for generated test sets"),
+    "standard": ("evaluate_running_times_standard", "table of running times for benchmarking test sets"),
+    "symmetry": ("evaluate_symmetry_statistics", "symmetry statistics of a test set"),
+    "tables": ("generate_tables_symmetrydetection", "all tables on symmetry detection"),
+    "compare": ("comparison", "paired comparison of two settings with confidence intervals"),
+    "plot": ("plot_running_times", "performance profiles and solved instances over time"),
+    "export": ("export_records", "export of per-instance records to CSV or Parquet"),
+    "follow": ("follow_results", "progress of running experiments"),
+    "run": ("run_experiments", "parallel experiment runner"),
+    "collect": ("collect_symmetry_statistics", "presolve-only collection of symmetry statistics")
+}
+
+def usage(prog):
+    '''
+    returns the usage message listing all subcommands
+
+    prog - name of the program
+    '''
+
+    lines = [f"usage: {prog} <command> [<args>]", "", "commands:"]
+    for command in COMMANDS:
+        lines.append(f"  {command:12s}{COMMANDS[command][1]}")
+    lines += ["", f"Call {prog} <command> --help for the arguments of a command."]
+
+    return "\n".join(lines)
+
+def main(argv=None):
+    '''
+    runs the subcommand given on the command line
+
+    Only the module implementing the subcommand is imported, such that the startup
+    of a subcommand does not pay for the dependencies of the other subcommands.
+
+    argv - list of command line arguments (None if the arguments of the script shall be used)
+    '''
+
+    argv = sys.argv[1:] if argv is None else argv
+    prog = os.path.basename(sys.argv[0])
+
+    if len(argv) == 0 or argv[0] in ("-h", "--help"):
+        print(usage(prog))
+        sys.exit(0 if len(argv) > 0 else 2)
+
+    if argv[0] not in COMMANDS:
+        print(usage(prog), file=sys.stderr)
+        print(f"\n{prog}: error: unknown command {argv[0]}", file=sys.stderr)
+        sys.exit(2)
+
+    module = importlib.import_module(COMMANDS[argv[0]][0])
+    module.main(argv[1:], f"{prog} {argv[0]}")
+
+if __name__ == "__main__":
+    main()
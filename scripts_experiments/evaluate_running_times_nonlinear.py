@@ -1,86 +1,67 @@
 import argparse
-import math
-import matplotlib.pyplot as plt
-
-SOLVED = 0
-MEMORYLIMIT = 1
-TIMELIMIT = 2
+import numpy as np
+import aggregation
+import log_discovery
+from log_parser import SOLVED
+from records import average_seeds
+import results_cache
 
 TIMESHIFT = 1.0
 INTEGRALSHIFT = 0
 
-def extract_statistics(results_file, timelim):
-
-    statistics = dict()
-
-    f = open(results_file, 'r')
-
-    name = ""
-    stats = None
-    for line in f:
-
-        if line.startswith("@01"):
-            name = line.split()[1].split('/')[-1]
-            sname = name.split('_')
-            name = (int(sname[1][1:]), int(sname[2][1:]))
-            stats = {
-                "status": SOLVED,
-                "time": -1,
-                "gap": -1,
-                "primaldual": -1
-                }
-        elif line.startswith("SCIP Status        : solving was interrupted [memory limit reached]"):
-            stats["status"] = MEMORYLIMIT
-        elif line.startswith("SCIP Status        : solving was interrupted [time limit reached]"):
-            stats["status"] = TIMELIMIT
-        elif line.startswith("Solving Time (sec)"):
-            if stats["status"] == MEMORYLIMIT:
-                stats["time"] = timelim
-            else:
-                stats["time"] = min(timelim, float(line.split()[-1]))
-        elif line.startswith("Gap                :"):
-            stats["gap"] = float(line.split()[2])
-        elif line.startswith("  primal-dual      :"):
-            stats["primaldual"] = float(line.strip().split()[2])
-        elif line.startswith("@04"):
-            statistics[name] = stats
-
-    f.close()
-
-    return statistics
-
-def print_summary_line(stats, setting_name):
-
-    gmean2 = 1.0
-    gmean3 = 1.0
-    gintegral2 = 1.0
-    gintegral3 = 1.0
-    cnt2 = 0
-    cnt3 = 0
-    nsolved2 = 0
-    nsolved3 = 0
-
-    for (n,d) in stats:
-        if d == 2:
-            gmean2 = math.pow(gmean2, cnt2/(cnt2 + 1)) * math.pow(stats[n,d]["time"] + TIMESHIFT, 1/(cnt2 + 1))
-            gintegral2  = math.pow(gintegral2, cnt2/(cnt2 + 1)) * math.pow(stats[n,d]["primaldual"], 1/(cnt2 + 1))
-            cnt2 += 1
-
-            if stats[n,d]["status"] == SOLVED:
-                nsolved2 += 1
-        else:
-            assert d == 3
-            gmean3 = math.pow(gmean3, cnt3/(cnt3 + 1)) * math.pow(stats[n,d]["time"] + TIMESHIFT, 1/(cnt3 + 1))
-            gintegral3  = math.pow(gintegral3, cnt3/(cnt3 + 1)) * math.pow(stats[n,d]["primaldual"], 1/(cnt3 + 1))
-            cnt3 += 1
-
-            if stats[n,d]["status"] == SOLVED:
-                nsolved3 += 1
-
-    gmean2 -= TIMESHIFT
-    gmean3 -= TIMESHIFT
-    gintegral2 -= INTEGRALSHIFT
-    gintegral3 -= INTEGRALSHIFT
+def instance_key(name):
+    '''
+    returns the pair (N, D) encoded in the name of a generated instance
+
+    name - name of the instance, e.g., "elec_N10_D2_sym0.cip"
+    '''
+
+    sname = name.split('_')
+
+    return (int(sname[1][1:]), int(sname[2][1:]))
+
+def records_to_statistics(records):
+
+    return average_seeds((instance_key(record.name), record) for record in records)
+
+def extract_statistics(results_file, timelim, cache_file=None):
+
+    return records_to_statistics(results_cache.get_records(results_file, timelim, cache_file))
+
+def summarize(statistics, settings):
+    '''
+    computes the summary columns of all settings for dimension 2 and 3 in one pass
+
+    Returns a dictionary mapping a dimension to a triple of arrays containing, for each
+    setting, the number of solved instances, the shifted geometric mean of the running
+    times, and the shifted geometric mean of the primal-dual integrals.
+
+    statistics - dictionary mapping a setting to the statistics of a test set
+    settings   - list of settings to be summarized
+    '''
+
+    instances = sorted(set().union(*(statistics[sett].keys() for sett in settings)))
+    dims = np.array([d for (n,d) in instances])
+    assert np.isin(dims, [2,3]).all()
+
+    times, present = aggregation.field_matrix(statistics, settings, instances, "time")
+    primaldual, _ = aggregation.field_matrix(statistics, settings, instances, "primaldual")
+    status, _ = aggregation.field_matrix(statistics, settings, instances, "status")
+
+    summary = dict()
+    for dim in [2,3]:
+        mask = present & (dims == dim)
+        summary[dim] = (aggregation.counts(mask & (status == SOLVED)),
+                        aggregation.shifted_geometric_means(times, TIMESHIFT, mask),
+                        aggregation.shifted_geometric_means(primaldual, INTEGRALSHIFT, mask))
+
+    return summary
+
+def print_summary_line(summary, s, setting_name):
+
+    (nsolved2, gmean2, gintegral2) = (summary[2][0][s], summary[2][1][s], summary[2][2][s])
+    (nsolved3, gmean3, gintegral3) = (summary[3][0][s], summary[3][1][s], summary[3][2][s])
+
     print("%20s & %3d & %7.2f & %11.1f & %3d & %7.2f & %11.1f\\\\" % (setting_name, nsolved2, gmean2, gintegral2, nsolved3, gmean3, gintegral3))
 
 def print_detailed_line(statistics, n, dim, field):
@@ -88,12 +69,12 @@ def print_detailed_line(statistics, n, dim, field):
     line = "%6d" % n
     if field == "time":
         for i in range(7):
-            line += ' & \\num{%7.2f}' % statistics[i][n,dim][field]
-        line += ' & \\num{%7.2f}\\\\' % statistics[-1][n,dim][field]
+            line += ' & \\num{%7.2f}' % getattr(statistics[i][n,dim], field)
+        line += ' & \\num{%7.2f}\\\\' % getattr(statistics[-1][n,dim], field)
     else:
         for i in range(7):
-            line += ' & \\num{%7.0f}' % statistics[i][n,dim][field]
-        line += ' & \\num{%7.0f}\\\\' % statistics[-1][n,dim][field]
+            line += ' & \\num{%7.0f}' % getattr(statistics[i][n,dim], field)
+        line += ' & \\num{%7.0f}\\\\' % getattr(statistics[-1][n,dim], field)
     print(line)
 
 def display_summary_header(tname):
@@ -132,10 +113,13 @@ def display_footer():
 
 def display_summary_tables(statistics, tname):
 
+    settings = list(range(7)) + [-1]
+    summary = summarize(statistics, settings)
+
     display_summary_header(tname)
     for i in range(7):
-        print_summary_line(statistics[i], f"sym{i}")
-    print_summary_line(statistics[-1], "automatic")
+        print_summary_line(summary, i, f"sym{i}")
+    print_summary_line(summary, len(settings) - 1, "automatic")
     display_footer()
 
 def display_intermediate_header(header):
@@ -160,28 +144,54 @@ def display_detailed_tables(statistics, tname, dim):
 
     display_footer()
 
-if __name__ == "__main__":
+def main(argv=None, prog=None):
+    '''
+    displays the tables of running times of the generated test set given on the command line
+
+    argv - list of command line arguments (None if the arguments of the script shall be used)
+    prog - name of the program shown in messages (None if the name of the script shall be used)
+    '''
 
     # create a parser for arguments
-    parser = argparse.ArgumentParser(description='evaluates the running times for a test set')
+    parser = argparse.ArgumentParser(prog=prog, description='evaluates the running times for a test set')
     parser.add_argument('results', metavar='results', type=str, help='directory containing results')
     parser.add_argument('tname', metavar='tname', type=str, help='name of test set')
     parser.add_argument('--timelim', metavar='timelim', type=int, default=7200, help='time limit of experiments')
+    parser.add_argument('--cache', metavar='cache', type=str, default=None,
+                        help='SQLite file caching parsed results (default: no cache)')
+    parser.add_argument('--jobs', metavar='jobs', type=int, default=1, help='number of processes parsing results files')
     parser.add_argument('--full', default=False, action='store_true', help='whether full results shall be printed')
+    parser.add_argument('--host', metavar='host', type=str, default=None, help='only use logs created on this host')
+    parser.add_argument('--binary', metavar='binary', type=str, default=None, help='only use logs created by this binary')
+    parser.add_argument('--nosymsettings', metavar='nosymsettings', type=str, default="nosym_nonlinear",
+                        help='settings of the runs of the sym0, ..., sym6 test sets')
+    parser.add_argument('--symsettings', metavar='symsettings', type=str, default="sym_nonlinear",
+                        help='settings of the run using automatic symmetry handling')
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs needs to be positive")
 
-    statistics = dict()
+    index = log_discovery.LogIndex(args.results)
+    names = dict()
 
-    for i in range(7):
-        name = args.results + "/"  + f"check.{args.tname}_sym{i}.scip-10.0.0.0.linux.x86_64.gnu.opt.spx2.none.moskito.nosym_nonlinear.out"
-        statistics[i] = extract_statistics(name, args.timelim)
+    try:
+        for i in range(7):
+            names[i] = index.find_logs(f"{args.tname}_sym{i}", args.nosymsettings, args.host, args.binary)
 
-    name = args.results + "/"  + f"check.{args.tname}_sym0.scip-10.0.0.0.linux.x86_64.gnu.opt.spx2.none.moskito.sym_nonlinear.out"
-    statistics[-1] = extract_statistics(name, args.timelim)
+        names[-1] = index.find_logs(f"{args.tname}_sym0", args.symsettings, args.host, args.binary)
+    except (FileNotFoundError, ValueError) as e:
+        parser.error(str(e))
+
+    # parse all files at once, possibly in parallel
+    records = results_cache.load_records([name for i in names for name in names[i]], args.timelim, args.cache, args.jobs)
+    statistics = {i: records_to_statistics(record for name in names[i] for record in records[name]) for i in names}
 
     if not args.full:
         display_summary_tables(statistics, args.tname)
     else:
         display_detailed_tables(statistics, args.tname, 2)
         display_detailed_tables(statistics, args.tname, 3)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 import argparse
-import math
-
-SOLVED = 0
-MEMORYLIMIT = 1
-TIMELIMIT = 2
+import numpy as np
+import aggregation
+import log_discovery
+from log_parser import SOLVED
+from records import average_seeds
+import results_cache
 
 TIMESHIFT = 1.0
 INTEGRALSHIFT = 0
@@ -36,72 +37,44 @@ skipped_instances = [
     "tokyometro.mps.gz"
 ]
 
-def extract_statistics(results_file, timelim):
-
-    statistics = dict()
-
-    f = open(results_file, 'r')
-
-    name = ""
-    stats = None
-    stats_solved = None
-    for line in f:
-
-        if line.startswith("@01"):
-            name = line.split()[1].split('/')[-1]
-            stats = {
-                "status": SOLVED,
-                "time": -1,
-                "gap": -1
-                }
-        elif line.startswith("SCIP Status        : solving was interrupted [memory limit reached]"):
-            stats["status"] = MEMORYLIMIT
-        elif line.startswith("SCIP Status        : solving was interrupted [time limit reached]"):
-            stats["status"] = TIMELIMIT
-        elif line.startswith("Solving Time (sec)"):
-            if stats["status"] == MEMORYLIMIT:
-                stats["time"] = timelim
-            else:
-                stats["time"] = min(timelim, float(line.split()[-1]))
-        elif line.startswith("Gap                :"):
-            if line.split()[2] == "infinite":
-                stats["gap"] = 10000.0
-            else:
-                stats["gap"] = float(line.split()[2])
-        elif line.startswith("@04"):
-            statistics[name] = stats
-
-    f.close()
-
-    return statistics
-
-def print_line(stats, setting_name, solved_instances):
-
-    time = 1.0
-    gap = 0.0
-    cnt = 0
-    cnt_solved = 0
-    time_solved = 1.0
-    gap_solved = 0.0
-    nsolved = 0
-
-    for inst in stats:
-        if inst in skipped_instances:
-            continue
-        time = math.pow(time, cnt/(cnt + 1)) * math.pow(stats[inst]["time"] + TIMESHIFT, 1/(cnt + 1))
-        gap = (gap * cnt + stats[inst]["gap"]) / (cnt + 1)
-        cnt += 1
-
-        if inst in solved_instances:
-            time_solved = math.pow(time_solved, cnt_solved/(cnt_solved + 1)) * math.pow(stats[inst]["time"] + TIMESHIFT, 1/(cnt_solved + 1))
-            gap_solved = (gap_solved * cnt_solved + stats[inst]["gap"]) / (cnt_solved + 1)
-            cnt_solved += 1
-
-        if stats[inst]["status"] == SOLVED:
-            nsolved += 1
-
-    time -= TIMESHIFT
-    time_solved -= TIMESHIFT
+def records_to_statistics(records):
+
+    return average_seeds((record.name, record) for record in records)
+
+def extract_statistics(results_file, timelim, cache_file=None):
+
+    return records_to_statistics(results_cache.get_records(results_file, timelim, cache_file))
+
+def summarize(statistics, solved_instances):
+    '''
+    computes the columns of all settings of a test set in one pass
+
+    Returns a tuple of arrays containing, for each setting, the number of solved instances,
+    the shifted geometric means of the running times over all and over the solved instances,
+    and the mean gaps over all and over the solved instances.
+
+    statistics       - dictionary mapping a setting to the statistics of a test set
+    solved_instances - set of instances solved by at least one setting
+    '''
+
+    settings = list(statistics.keys())
+    instances = sorted(set().union(*(statistics[sett].keys() for sett in settings)).difference(skipped_instances))
+
+    times, present = aggregation.field_matrix(statistics, settings, instances, "time")
+    gaps, _ = aggregation.field_matrix(statistics, settings, instances, "gap")
+    status, _ = aggregation.field_matrix(statistics, settings, instances, "status")
+    solved = present & np.array([inst in solved_instances for inst in instances], dtype=bool)
+
+    return (aggregation.counts(present & (status == SOLVED)),
+            aggregation.shifted_geometric_means(times, TIMESHIFT, present),
+            aggregation.shifted_geometric_means(times, TIMESHIFT, solved),
+            aggregation.arithmetic_means(gaps, present),
+            aggregation.arithmetic_means(gaps, solved))
+
+def print_line(summary, s, setting_name):
+
+    (nsolved, time, time_solved, gap, gap_solved) = (column[s] for column in summary)
+
     print("    %s & %3d & %7.2f & %7.2f & %8.2f & %8.2f\\\\" % (setting_name, nsolved, time, time_solved, gap, gap_solved))
 
 def get_solved_instances(statistics):
@@ -110,7 +83,7 @@ def get_solved_instances(statistics):
 
     for sett in statistics:
         for inst in statistics[sett] :
-            if statistics[sett][inst]["status"] == SOLVED and not inst in skipped_instances:
+            if statistics[sett][inst].status == SOLVED and not inst in skipped_instances:
                 solved_instances.add(inst)
 
     return solved_instances
@@ -145,27 +118,59 @@ def display_tables(statistics):
         solved_instances = get_solved_instances(statistics[t])
         n_stable = sum(1 for inst in statistics[t][0].keys() if not inst in skipped_instances)
 
+        summary = summarize(statistics[t], solved_instances)
+
         display_subheader(t, n_stable, len(solved_instances))
         for i in range(5):
-            print_line(statistics[t][i], setting_encoding[i], solved_instances)
+            print_line(summary, i, setting_encoding[i])
     display_footer()
 
-if __name__ == "__main__":
+def main(argv=None, prog=None):
+    '''
+    displays the table of running times of the benchmarking test sets given on the command line
+
+    argv - list of command line arguments (None if the arguments of the script shall be used)
+    prog - name of the program shown in messages (None if the name of the script shall be used)
+    '''
 
     # create a parser for arguments
-    parser = argparse.ArgumentParser(description='evaluates the running times for a test set')
+    parser = argparse.ArgumentParser(prog=prog, description='evaluates the running times for a test set')
     parser.add_argument('results', metavar='results', type=str, help='directory containing results')
     parser.add_argument('--tname', metavar='tname', type=str, action='append', help='name of test set to be added')
     parser.add_argument('--timelim', metavar='timelim', type=int, default=7200, help='time limit of experiments')
-
-    args = parser.parse_args()
-
-    statistics = { t: dict() for t in args.tname}
-    statistics_solved = { t: dict() for t in args.tname}
-
-    for t in args.tname:
-        for i in range(5):
-            name = args.results + "/"  + f"check.{t}.scip-10.0.0.0.linux.x86_64.gnu.opt.spx2.none.moskito.{setting_name[i]}.out"
-            statistics[t][i] = extract_statistics(name, args.timelim)
+    parser.add_argument('--cache', metavar='cache', type=str, default=None,
+                        help='SQLite file caching parsed results (default: no cache)')
+    parser.add_argument('--jobs', metavar='jobs', type=int, default=1, help='number of processes parsing results files')
+    parser.add_argument('--host', metavar='host', type=str, default=None, help='only use logs created on this host')
+    parser.add_argument('--binary', metavar='binary', type=str, default=None, help='only use logs created by this binary')
+    parser.add_argument('--settings', metavar='settings', type=str, action='append', default=None,
+                        help='name of settings, to be given once per row of the table (default: sym_*_doublelex_* settings)')
+
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs needs to be positive")
+
+    settings = setting_name if args.settings is None else args.settings
+    if len(settings) != len(setting_encoding):
+        parser.error(f"expected {len(setting_encoding)} settings, but received {len(settings)}")
+
+    index = log_discovery.LogIndex(args.results)
+    names = { t: dict() for t in args.tname}
+
+    try:
+        for t in args.tname:
+            for i in range(5):
+                names[t][i] = index.find_logs(t, settings[i], args.host, args.binary)
+    except (FileNotFoundError, ValueError) as e:
+        parser.error(str(e))
+
+    # parse all files at once, possibly in parallel
+    records = results_cache.load_records([name for t in names for i in names[t] for name in names[t][i]],
+                                         args.timelim, args.cache, args.jobs)
+    statistics = { t: {i: records_to_statistics(record for name in names[t][i] for record in records[name])
+                       for i in names[t]} for t in names}
 
     display_tables(statistics)
+
+if __name__ == "__main__":
+    main()
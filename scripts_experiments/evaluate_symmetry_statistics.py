@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 import argparse
+from records import average_seeds
+import results_cache
 
 ENDINGS = [".mps.gz", ".cip", ".osil.gz", ".cnf"]
 
@@ -24,27 +26,87 @@ def display_aggregated_results(statistics, testset_name):
     for instance in statistics:
         stats = statistics[instance]
 
-        if stats["nperms"] > 0 or stats["nsperms"] > 0:
+        if stats.nperms > 0 or stats.nsperms > 0:
             n_symmetric += 1
-        if stats["nperms"] > 0:
+        if stats.nperms > 0:
             n_perm += 1
-        if stats["nsperms"] > 0:
+        if stats.nsperms > 0:
             n_sperm += 1
-        if stats["nsdoublelex"] > 0:
+        if stats.nsdoublelex > 0:
             n_sdoublelex += 1
-        if stats["norbitope"] > 0:
+        if stats.norbitope > 0:
             n_orbitope += 1
-        if stats["ndoublelex"] > 0:
+        if stats.ndoublelex > 0:
             n_doublelex += 1
-        if stats["nsorbitope"] > 0:
+        if stats.nsorbitope > 0:
             n_sorbitope += 1
-        if stats["nsimple"] > 0:
+        if stats.nsimple > 0:
             n_simple += 1
 
     print("  %20s & %4d & %4d & %4d & %4d & %4d & %4d & %4d & %4d & %4d\\\\"
           % (latexify(testset_name), len(statistics.keys()), n_symmetric, n_sperm, n_perm,
              n_sdoublelex, n_doublelex, n_sorbitope, n_orbitope, n_simple))
 
+def timing_phases(statistics):
+    '''
+    returns a dictionary mapping phases of symmetry handling to the list of their times for all instances of a test set
+
+    The phases are the construction of the symmetry detection graph, the computation of
+    its automorphisms, the detection of lex matrices, the generation of constraints
+    for row and column symmetries, and the generation of constraints for all orbitopes
+    (including signed orbitopes) and lex matrices, each measured by a wall clock and a
+    CPU clock of the patched version of prop_symmetry.c. Instances without the corresponding
+    information, e.g., logs of older versions of the patch, are skipped.
+
+    statistics - dictionary containing statistics of entire test set
+    '''
+
+    phases = {"graph wall": [], "graph cpu": [], "automorphisms wall": [], "automorphisms cpu": [],
+              "detection wall": [], "detection cpu": [], "doublelex wall": [], "doublelex cpu": [],
+              "generation wall": [], "generation cpu": []}
+
+    for instance in statistics:
+        stats = statistics[instance]
+
+        if stats.graphwall >= 0:
+            phases["graph wall"].append(stats.graphwall)
+            phases["graph cpu"].append(stats.graphcpu)
+            phases["automorphisms wall"].append(stats.automorphismswall)
+            phases["automorphisms cpu"].append(stats.automorphismscpu)
+            phases["detection wall"].append(stats.detectionwall)
+            phases["detection cpu"].append(stats.detectioncpu)
+        if stats.ndoublelex > 0 and stats.symtime >= 0:
+            phases["doublelex wall"].append(stats.doublelexwall)
+            phases["doublelex cpu"].append(stats.doublelexcpu)
+        if stats.generationwall >= 0:
+            phases["generation wall"].append(stats.generationwall)
+            phases["generation cpu"].append(stats.generationcpu)
+
+    return phases
+
+def display_timing_results(statistics, testset_name):
+    '''
+    from statistics of SCIP experiments, displays the distribution of the time spent in the phases of symmetry handling
+
+    For each phase, the number of instances, the mean, the median, the 90% quantile,
+    and the maximum of the times are shown.
+
+    statistics   - dictionary containing statistics of entire test set
+    testset_name - name of the test set
+    '''
+
+    import numpy as np
+
+    for (phase, times) in timing_phases(statistics).items():
+        if len(times) == 0:
+            print("  %20s & %18s & %4d & %8s & %8s & %8s & %8s\\\\" % (latexify(testset_name), phase, 0, "--", "--", "--", "--"))
+            continue
+
+        times = np.array(times)
+        (median, quantile) = np.percentile(times, [50, 90])
+        print("  %20s & %18s & %4d & %8.3f & %8.3f & %8.3f & %8.3f\\\\"
+              % (latexify(testset_name), phase, len(times), times.mean(), median, quantile, times.max()))
+
 def latexify(string):
     '''
     makes a string LaTeX compatible
@@ -82,22 +144,22 @@ def display_full_line(statistics, instance_name):
 
     # extract information about different symmetry types
     signed_row_column_sym = dict()
-    for key in statistics["sdoublelex"]:
+    for key in statistics.sdoublelex:
         signed_row_column_sym.setdefault(key, 0)
         signed_row_column_sym[key] += 1
 
     row_column_sym = dict()
-    for key in statistics["doublelex"]:
+    for key in statistics.doublelex:
         row_column_sym.setdefault(key, 0)
         row_column_sym[key] += 1
 
     signed_row_sym = dict()
-    for key in statistics["sorbitope"]:
+    for key in statistics.sorbitope:
         signed_row_sym.setdefault(key, 0)
         signed_row_sym[key] += 1
 
     row_sym = dict()
-    for key in statistics["orbitope"]:
+    for key in statistics.orbitope:
         row_sym.setdefault(key, 0)
         row_sym[key] += 1
 
@@ -116,8 +178,8 @@ def display_full_line(statistics, instance_name):
     for (r,c) in row_sym.keys():
         line += "\mbox{%d$\cdot$C(%d, %d)} " % (row_sym[r,c], r, c)
         found = True
-    if statistics["nsimple"] != 0:
-        line += "\mbox{S(%d)}" % statistics["nsimple"]
+    if statistics.nsimple != 0:
+        line += "\mbox{S(%d)}" % statistics.nsimple
         found = True
 
     if not found:
@@ -138,95 +200,57 @@ def display_full_results(statistics):
     for instance in statistics:
         display_full_line(statistics[instance], instance)
 
-def extract_symmetry_statistics(results_file):
+def extract_symmetry_statistics(results_file, cache_file=None):
     '''
     from the SCIP results for an entire test set, extracts information about symmetry groups
 
     results_file - path to file containing the SCIP results
+    cache_file   - path to file caching parsed results (None if no cache shall be used)
     '''
 
-    statistics = dict()
-
-    f = open(results_file, 'r')
-
-    name = ""
-    stats = None
-    for line in f:
-
-        if line.startswith("@01"):
-            # a new instance is detected
-            name = line.split()[1].split('/')[-1]
-            stats = {
-                "nperms": -1,
-                "nsperms": -1,
-                "nsdoublelex": 0,
-                "sdoublelex": [],
-                "norbitope": 0,
-                "orbitope": [],
-                "ndoublelex": 0,
-                "doublelex": [],
-                "nsorbitope": 0,
-                "sorbitope": [],
-                "nsimple": 0
-            }
-        elif line.startswith("@04"):
-            # store statistics
-            statistics[name] = stats
-        elif "SYMMETRY" in line:
-            sline = line.strip()
-
-            if sline.startswith("SYMMETRY stats perms"):
-                ssline = sline.split()
-                stats["nperms"] = int(ssline[3])
-                stats["nsperms"] = int(ssline[5])
-            elif "simplecut" in sline:
-                stats["nsimple"] += 1
-            elif "doublelexorbitope" in sline:
-                ssline = sline.split()
-                stats["nsdoublelex"] += 1
-                stat = tuple([int(ssline[5]), int(ssline[7]), int(ssline[9])])
-                stats["sdoublelex"].append(stat)
-            elif "orbitope dynamic" in sline:
-                ssline = sline.split()
-                stats["norbitope"] += 1
-                stat = tuple([int(ssline[6]), int(ssline[8])])
-                stats["orbitope"].append(stat)
-            elif "doublelex columnblocks" in sline:
-                ssline = sline.split()
-                stats["ndoublelex"] += 1
-                stat = [int(ssline[5]), int(ssline[7])]
-                for i in range(stat[0]):
-                    stat.append(int(ssline[9 + i]))
-                for i in range(stat[1]):
-                    stat.append(int(ssline[9 + stat[0] + 1 + i]))
-                stat = tuple(stat)
-                stats["doublelex"].append(stat)
-            else:
-                assert "signedorbitope" in sline
-
-                ssline = sline.split()
-                stats["nsorbitope"] += 1
-                stat = tuple([int(ssline[5]), int(ssline[7])])
-                stats["sorbitope"].append(stat)
-
-    f.close()
-
-    return statistics
+    return records_to_statistics(results_cache.get_records(results_file, None, cache_file))
 
+def records_to_statistics(records):
+    '''
+    returns a dictionary mapping the names of instances to their records
 
-if __name__ == "__main__":
+    If an instance occurs several times with the same seed, its last record is used;
+    runs with different seeds are combined by records.mean_record.
+
+    records - iterable of records
+    '''
+
+    return average_seeds((record.name, record) for record in records)
+
+
+def main(argv=None, prog=None):
+    '''
+    displays the symmetry statistics of the log given on the command line
+
+    argv - list of command line arguments (None if the arguments of the script shall be used)
+    prog - name of the program shown in messages (None if the name of the script shall be used)
+    '''
 
     # create a parser for arguments
-    parser = argparse.ArgumentParser(description='evaluates the symmetry structures for a test set')
+    parser = argparse.ArgumentParser(prog=prog, description='evaluates the symmetry structures for a test set')
     parser.add_argument('results', metavar='results', type=str, help='file containing results for a test set')
     parser.add_argument('tname', metavar='tname', type=str, help='name of test set')
     parser.add_argument('--full', action='store_true', default=False, help='shall results per instance be created')
+    parser.add_argument('--timing', action='store_true', default=False,
+                        help='shall the distribution of the time spent in the phases of symmetry handling be displayed')
+    parser.add_argument('--cache', metavar='cache', type=str, default=None,
+                        help='SQLite file caching parsed results (default: no cache)')
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    statistics = extract_symmetry_statistics(args.results)
+    statistics = extract_symmetry_statistics(args.results, args.cache)
 
     if args.full:
         display_full_results(statistics)
+    elif args.timing:
+        display_timing_results(statistics, args.tname)
     else:
         display_aggregated_results(statistics, args.tname)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import log_discovery
+import records
+import results_cache
+
+def main(argv=None, prog=None):
+    '''
+    exports the records of the logs given on the command line
+
+    argv - list of command line arguments (None if the arguments of the script shall be used)
+    prog - name of the program shown in messages (None if the name of the script shall be used)
+    '''
+
+    # create a parser for arguments
+    parser = argparse.ArgumentParser(prog=prog, description='exports the per-instance records of SCIP logs to a CSV or Parquet file')
+    parser.add_argument('logs', metavar='logs', type=str, nargs='+', help='files containing results')
+    parser.add_argument('--output', metavar='output', type=str, required=True, help='target file ending with .csv or .parquet')
+    parser.add_argument('--timelim', metavar='timelim', type=int, default=7200, help='time limit of experiments')
+    parser.add_argument('--cache', metavar='cache', type=str, default=None,
+                        help='SQLite file caching parsed results (default: no cache)')
+    parser.add_argument('--jobs', metavar='jobs', type=int, default=1, help='number of processes parsing results files')
+
+    args = parser.parse_args(argv)
+
+    if not args.output.endswith((".csv", ".parquet")):
+        parser.error("the name of the output file needs to end with .csv or .parquet")
+
+    parsed = results_cache.load_records(args.logs, args.timelim, args.cache, args.jobs)
+
+    # identify the run of each record by the fields of the name of its log
+    allrecords = []
+    extra = {"testset": [], "settings": [], "host": []}
+    for log in args.logs:
+        fields = log_discovery.parse_log_name(os.path.basename(log))
+        if fields is None:
+            fields = {"testset": log, "settings": "", "host": ""}
+        for record in parsed[log]:
+            allrecords.append(record)
+            for column in extra:
+                extra[column].append(fields[column])
+
+    if args.output.endswith(".csv"):
+        records.export_csv(allrecords, args.output, extra)
+    else:
+        records.export_parquet(allrecords, args.output, extra)
+
+if __name__ == "__main__":
+    main()
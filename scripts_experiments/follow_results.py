@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+import argparse
+import math
+import os
+import sys
+import time
+import log_discovery
+from log_parser import LogParser, SOLVED
+
+TIMESHIFT = 1.0
+
+class RunningSummary:
+    '''
+    Summary of the instances of a log that is updated whenever a new instance finished.
+    '''
+
+    def __init__(self, shift=TIMESHIFT):
+        '''
+        initializes an empty summary
+
+        shift - shift of the geometric mean of running times
+        '''
+
+        self.shift = shift
+        self.ninstances = 0
+        self.nsolved = 0
+        self.logsum = 0.0
+
+    def add(self, record):
+        '''
+        adds the record of a finished instance to the summary
+
+        record - record of the instance
+        '''
+
+        self.ninstances += 1
+        self.logsum += math.log(record.time + self.shift)
+        if record.status == SOLVED:
+            self.nsolved += 1
+
+    def shifted_geometric_mean(self):
+        '''
+        returns the shifted geometric mean of the running times of all finished instances
+        '''
+
+        return math.exp(self.logsum / max(self.ninstances, 1)) - self.shift
+
+class LogFollower:
+    '''
+    Follows a growing log file and parses only the bytes appended since the last poll.
+    '''
+
+    def __init__(self, path, timelim):
+        '''
+        initializes the follower, no byte of the log is read yet
+
+        path    - path to the log file
+        timelim - time limit of the experiments
+        '''
+
+        self.path = path
+        self.timelim = timelim
+        self.reset()
+
+    def reset(self):
+        '''
+        forgets all information that has been parsed so far
+        '''
+
+        self.offset = 0
+        self.partial = b""
+        self.parser = LogParser(self.timelim)
+        self.summary = RunningSummary()
+
+    def poll(self):
+        '''
+        parses the bytes appended to the log since the last poll and returns the records of newly finished instances
+        '''
+
+        # the log has been truncated or replaced, start from scratch
+        if os.path.getsize(self.path) < self.offset:
+            self.reset()
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        self.offset += len(data)
+
+        # the last line might not be complete yet
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+
+        records = []
+        for line in lines:
+            record = self.parser.feed(line.decode(errors="replace") + "\n")
+            if record is not None:
+                self.summary.add(record)
+                records.append(record)
+
+        return records
+
+def display_progress(followers):
+    '''
+    prints the summary of all followed logs
+
+    followers - dictionary mapping a triple (testset, settings, host) to the follower of its log
+    '''
+
+    print(time.strftime("%Y-%m-%d %H:%M:%S"))
+    print("%-30s %-45s %-15s %9s %7s %10s" % ("test set", "settings", "host", "finished", "solved", "sgm time"))
+    for (testset, settings, host) in sorted(followers):
+        summary = followers[testset, settings, host].summary
+        print("%-30s %-45s %-15s %9d %7d %10.2f" % (testset, settings, host, summary.ninstances, summary.nsolved,
+                                                    summary.shifted_geometric_mean()))
+    print()
+    sys.stdout.flush()
+
+def main(argv=None, prog=None):
+    '''
+    follows the logs given on the command line and displays their progress
+
+    argv - list of command line arguments (None if the arguments of the script shall be used)
+    prog - name of the program shown in messages (None if the name of the script shall be used)
+    '''
+
+    # create a parser for arguments
+    parser = argparse.ArgumentParser(prog=prog, description='follows the logs of running experiments and displays their progress')
+    parser.add_argument('results', metavar='results', type=str, help='directory containing results')
+    parser.add_argument('--tname', metavar='tname', type=str, action='append', default=None, help='name of test set to be followed')
+    parser.add_argument('--settings', metavar='settings', type=str, action='append', default=None, help='name of settings to be followed')
+    parser.add_argument('--host', metavar='host', type=str, default=None, help='only follow logs created on this host')
+    parser.add_argument('--timelim', metavar='timelim', type=int, default=7200, help='time limit of experiments')
+    parser.add_argument('--interval', metavar='interval', type=float, default=60.0, help='seconds between two updates')
+    parser.add_argument('--once', default=False, action='store_true', help='whether the progress shall be displayed only once')
+
+    args = parser.parse_args(argv)
+
+    followers = dict()
+    while True:
+        # new logs are created whenever a new run starts
+        for entry in log_discovery.LogIndex(args.results).select(host=args.host):
+            if args.tname is not None and entry["testset"] not in args.tname:
+                continue
+            if args.settings is not None and entry["settings"] not in args.settings:
+                continue
+            key = (entry["testset"], entry["settings"], entry["host"])
+            if entry["path"].endswith(".out") and key not in followers:
+                followers[key] = LogFollower(entry["path"], args.timelim)
+
+        updated = False
+        for follower in followers.values():
+            if follower.poll():
+                updated = True
+
+        if updated or args.once:
+            display_progress(followers)
+
+        if args.once:
+            break
+
+        time.sleep(args.interval)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+import argparse
+import evaluate_symmetry_statistics as ess
+import log_discovery
+import results_cache
+
+# test sets of the aggregated table, grouped by the kind of instances
+STRUCTURED_TESTSETS = ["packing_sym0", "kissing_sym0", "energy_sym0", "maxcut"]
+BENCHMARKING_TESTSETS = ["miplib2017", "minlplib", "sat2002"]
+
+def display_aggregated_table(statistics):
+    '''
+    displays the table summarizing which symmetry handling methods apply to how many instances of each test set
+
+    statistics - dictionary mapping the name of a test set to the statistics of its instances
+    '''
+
+    print("\\begin{table}[t]")
+    print("  \\caption{Statistics on how many instances allow for a particular symmetry handling method.}")
+    print("  \\label{tab:statistics}")
+    print("  \\centering")
+    print("  \\begin{tabular*}{\\textwidth}{@{}l@{\\;\\;\\extracolsep{\\fill}}rrrrrrrrr@{}}")
+    print("    \\toprule")
+    print("    & \\multicolumn{2}{c}{\\# instances} & \\multicolumn{2}{c}{generators} & \\multicolumn{2}{c}{row + column} "
+          "& \\multicolumn{2}{c}{row/column} & \\\\")
+    print("    \\cmidrule{2-3} \\cmidrule{4-5} \\cmidrule{6-7} \\cmidrule{8-9}")
+    print("    test set & total & sym. & sig. & unsig. & sig. & unsig. & sig. & unsig. & simple\\\\")
+    print("    \\midrule")
+    print("    \\multicolumn{10}{@{}l}{structured instances:}\\\\")
+    for testset in STRUCTURED_TESTSETS:
+        ess.display_aggregated_results(statistics[testset], testset)
+    print("    \\midrule")
+    print("    \\multicolumn{10}{@{}l}{benchmarking instances:}\\\\")
+    for testset in BENCHMARKING_TESTSETS:
+        ess.display_aggregated_results(statistics[testset], testset)
+    print("    \\bottomrule")
+    print("  \\end{tabular*}")
+    print("\\end{table}")
+
+def display_full_table(statistics, testset):
+    '''
+    displays the longtable listing the symmetry structures of each instance of a test set
+
+    statistics - dictionary mapping the names of instances of the test set to their records
+    testset    - name of the test set
+    '''
+
+    print("% generated by generate_tables_symmetrydetection.py")
+    print("\\begin{scriptsize}")
+    print("  \\begin{longtable}{@{}l@{\\;\\;\\extracolsep{\\fill}}R{9cm}@{}}")
+    print(f"    \\caption{{Statistics on which symmetry handling methods apply to which instance of the {testset} test set.}}")
+    print(f"    \\label{{tab:stats{testset}}}\\\\")
+    print("    \\toprule")
+    print("    % first header")
+    print("    instance & structured symmetries\\\\")
+    print("    \\midrule")
+    print("    \\endfirsthead")
+    print("    % header")
+    print("    instance & structured symmetries\\\\")
+    print("    \\midrule")
+    print("    \\endhead")
+    print("    % footer")
+    print("    \\midrule")
+    print("    \\endfoot")
+    print("    % last footer")
+    print("    \\bottomrule")
+    print("    \\endlastfoot")
+    ess.display_full_results(statistics)
+    print("  \\end{longtable}")
+    print("\\end{scriptsize}")
+
+def main(argv=None, prog=None):
+    '''
+    displays the tables on symmetry detection for the logs in the directory given on the command line
+
+    argv - list of command line arguments (None if the arguments of the script shall be used)
+    prog - name of the program shown in messages (None if the name of the script shall be used)
+    '''
+
+    # create a parser for arguments
+    parser = argparse.ArgumentParser(prog=prog, description='generates all tables on symmetry detection in a single pass')
+    parser.add_argument('results', metavar='results', type=str, nargs='?', default="../results/symmetry_statistics",
+                        help='directory containing the logs of the symmetry statistics')
+    parser.add_argument('--tables', metavar='tables', type=str, choices=["aggregated", "full", "all"], default="all",
+                        help='tables to be generated: the aggregated table, the tables per instance, or all tables')
+    parser.add_argument('--settings', metavar='settings', type=str, default="sym_1_doublelex_1_reflection_1_simple_1",
+                        help='settings of the runs')
+    parser.add_argument('--host', metavar='host', type=str, default=None, help='only use logs created on this host')
+    parser.add_argument('--binary', metavar='binary', type=str, default=None, help='only use logs created by this binary')
+    parser.add_argument('--cache', metavar='cache', type=str, default=None,
+                        help='SQLite file caching parsed results (default: no cache)')
+    parser.add_argument('--jobs', metavar='jobs', type=int, default=1, help='number of processes parsing results files')
+
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs needs to be positive")
+
+    index = log_discovery.LogIndex(args.results)
+    names = dict()
+
+    try:
+        for testset in STRUCTURED_TESTSETS + BENCHMARKING_TESTSETS:
+            names[testset] = index.find_logs(testset, args.settings, args.host, args.binary)
+    except (FileNotFoundError, ValueError) as e:
+        parser.error(str(e))
+
+    # parse all files at once, possibly in parallel
+    records = results_cache.load_records([name for testset in names for name in names[testset]], None, args.cache, args.jobs)
+    statistics = {testset: ess.records_to_statistics(record for name in names[testset] for record in records[name])
+                  for testset in names}
+
+    if args.tables in ("aggregated", "all"):
+        display_aggregated_table(statistics)
+    if args.tables in ("full", "all"):
+        for testset in STRUCTURED_TESTSETS + BENCHMARKING_TESTSETS:
+            display_full_table(statistics[testset], testset)
+
+if __name__ == "__main__":
+    main()
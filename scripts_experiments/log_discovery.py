@@ -0,0 +1,142 @@
+import log_files
+import records
+
+class LogIndex:
+    '''
+    Index of the log files of SCIP experiments contained in a results directory.
+
+    The names of the log files need to have the form
+    check.<testset>.<binary>.<host>.<settings>.out, possibly followed by an ending
+    of a compression method. Files of the same form ending with records.RECORDS_ENDING
+    instead of .out, as written by collect_symmetry_statistics.py, are indexed as well.
+    The directory is scanned once when the index is created. If a run has several
+    files, only the one with the preferred ending is indexed, see split_ending.
+    '''
+
+    def __init__(self, directory):
+        '''
+        scans a results directory, which may be contained in an archive
+
+        directory - path to the results directory
+        '''
+
+        self.directory = directory
+        self.entries = []
+
+        # the files of each log ordered by preference, i.e., uncompressed files first
+        files = dict()
+        for filename in log_files.list_directory(directory):
+            fields = parse_log_name(filename)
+            if fields is not None:
+                (name, rank) = split_ending(filename)
+                files.setdefault(name, []).append((rank, filename, fields))
+
+        for name in sorted(files):
+            (_, filename, fields) = min(files[name])
+            fields["path"] = directory.rstrip('/') + '/' + filename
+            self.entries.append(fields)
+
+    def select(self, testset=None, settings=None, host=None, binary=None):
+        '''
+        returns all entries matching the given fields, None matches every value
+
+        testset  - name of the test set
+        settings - name of the settings
+        host     - name of the host
+        binary   - name of the binary
+        '''
+
+        return [entry for entry in self.entries
+                if (testset is None or entry["testset"] == testset)
+                and (settings is None or entry["settings"] == settings)
+                and (host is None or entry["host"] == host)
+                and (binary is None or entry["binary"] == binary)]
+
+    def find_logs(self, testset, settings, host=None, binary=None):
+        '''
+        returns the paths to all log files of a test set and settings
+
+        If a test set has been split over several hosts, the paths of all hosts are
+        returned unless a host is specified.
+
+        testset  - name of the test set
+        settings - name of the settings
+        host     - name of the host (None if all hosts shall be used)
+        binary   - name of the binary (None if all binaries shall be used)
+        '''
+
+        entries = self.select(testset, settings, host, binary)
+
+        if not entries:
+            raise FileNotFoundError(f"no log file for test set {testset} and settings {settings} in {self.directory}")
+
+        binaries = set(entry["binary"] for entry in entries)
+        if len(binaries) > 1:
+            raise ValueError(f"logs of test set {testset} and settings {settings} exist for several binaries, "
+                             f"select one of {', '.join(sorted(binaries))}")
+
+        return [entry["path"] for entry in entries]
+
+def split_compression(filename):
+    '''
+    returns the name of a file without compression ending and the rank of this ending
+
+    The rank is 0 for uncompressed files and k for the k-th ending in
+    log_files.COMPRESSED_ENDINGS.
+
+    filename - name of the file
+    '''
+
+    for (k, ending) in enumerate(log_files.COMPRESSED_ENDINGS):
+        if filename.endswith(ending):
+            return filename[:-len(ending)], k + 1
+
+    return filename, 0
+
+def split_ending(filename):
+    '''
+    returns the name of a log file without ending and the rank of this ending, or None if it is no log
+
+    The rank orders the files of a run by preference: 0 for .out, k for .out followed
+    by the k-th ending in log_files.COMPRESSED_ENDINGS, and the largest rank for
+    records.RECORDS_ENDING. A log is preferred over a records file, because only the
+    log contains everything SCIP has printed.
+
+    filename - name of the file
+    '''
+
+    if filename.endswith(records.RECORDS_ENDING):
+        return filename[:-len(records.RECORDS_ENDING)], len(log_files.COMPRESSED_ENDINGS) + 1
+
+    (filename, rank) = split_compression(filename)
+    if not filename.endswith(".out"):
+        return None
+
+    return filename[:-len(".out")], rank
+
+def parse_log_name(filename):
+    '''
+    splits the name of a log file into its fields or returns None if it is not the name of a log
+
+    Returns a dictionary with keys "testset", "binary", "host", and "settings". Since the
+    name of the binary may contain dots, the test set is the first and the host and
+    settings are the last two dot-separated parts of the name.
+
+    filename - name of the log file, e.g.,
+               check.sat2002.scip-10.0.0.0.linux.x86_64.gnu.opt.spx2.none.moskito.sym_nonlinear.out
+    '''
+
+    split = split_ending(filename)
+    if split is None or not split[0].startswith("check."):
+        return None
+
+    parts = split[0][len("check."):].split('.')
+    if len(parts) < 4:
+        return None
+
+    return {
+        "testset": parts[0],
+        "binary": '.'.join(parts[1:-2]),
+        "host": parts[-2],
+        "settings": parts[-1]
+        }
@@ -0,0 +1,199 @@
+import gzip
+import io
+import os
+import tarfile
+
+# endings of archives whose members can be read directly
+ARCHIVE_ENDINGS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+# endings of individually compressed log files
+COMPRESSED_ENDINGS = (".gz", ".zst")
+
+# opened archives and the index of their members
+_archives = dict()
+
+def split_archive_path(path):
+    '''
+    splits a path into the path to an archive and the path of a member within this archive
+
+    If no prefix of the path is an archive, (None, path) is returned. For example,
+    "results.tar.gz/performance/check.out" is split into "results.tar.gz" and
+    "performance/check.out".
+
+    path - path to be split
+    '''
+
+    parts = path.split('/')
+    for k in range(1, len(parts)):
+        prefix = '/'.join(parts[:k])
+        if prefix.endswith(ARCHIVE_ENDINGS) and os.path.isfile(prefix):
+            return prefix, '/'.join(parts[k:])
+
+    return None, path
+
+def open_archive(archive):
+    '''
+    returns an opened archive and a dictionary mapping member names to members
+
+    archive - path to the archive
+    '''
+
+    if archive not in _archives:
+        tar = tarfile.open(archive, "r:*")
+        members = {member.name: member for member in tar.getmembers() if member.isfile()}
+        _archives[archive] = (tar, members)
+
+    return _archives[archive]
+
+def find_member(members, name):
+    '''
+    returns the member of an archive with a given name, possibly compressed, or None if it does not exist
+
+    Since archives usually contain a top-level directory, a member also matches if
+    its name ends with the given name.
+
+    members - dictionary mapping member names to members
+    name    - name of the member
+    '''
+
+    for candidate in (name,) + tuple(name + ending for ending in COMPRESSED_ENDINGS):
+        if candidate in members:
+            return members[candidate]
+
+        for membername in members:
+            if membername.endswith('/' + candidate):
+                return members[membername]
+
+    return None
+
+def resolve(path):
+    '''
+    returns a triple (archive, member, file) describing where the content of a log is stored
+
+    If the log is a member of an archive, archive is the path to the archive, member
+    the corresponding member, and file is None. Otherwise, archive and member are None
+    and file is the path to the (possibly compressed) log file.
+
+    path - path to the log
+    '''
+
+    archive, name = split_archive_path(path)
+
+    if archive is not None:
+        (tar, members) = open_archive(archive)
+        member = find_member(members, name)
+        if member is None:
+            raise FileNotFoundError(f"{name} is not contained in {archive}")
+        return archive, member, None
+
+    if not os.path.exists(path):
+        for ending in COMPRESSED_ENDINGS:
+            if os.path.exists(path + ending):
+                return None, None, path + ending
+
+    return None, None, path
+
+def decompress(f, name):
+    '''
+    wraps a binary stream such that reading from it returns decompressed data
+
+    f    - binary stream
+    name - name of the file the stream belongs to, used to detect the compression
+    '''
+
+    if name.endswith(".gz"):
+        return gzip.GzipFile(fileobj=f, mode='rb')
+    elif name.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(f"reading {name} requires the Python package zstandard")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(f, closefd=True))
+
+    return f
+
+def iterate_members(archive, names):
+    '''
+    generator of the pairs (name, binary stream) of the members of an archive with given names
+
+    The archive is read in a single streaming pass, i.e., a compressed archive is only
+    decompressed once, no matter how many members are read. Compressed members are
+    decompressed, see decompress. Each stream can only be read until the next pair is
+    requested.
+
+    archive - path to the archive
+    names   - collection of names of the members to be read
+    '''
+
+    with tarfile.open(archive, "r|*") as tar:
+        for member in tar:
+            if member.isfile() and member.name in names:
+                with decompress(tar.extractfile(member), member.name) as f:
+                    yield member.name, f
+
+def list_directory(path):
+    '''
+    returns the names of all files in a directory, the directory may be contained in an archive
+
+    path - path to the directory
+    '''
+
+    archive, name = split_archive_path(path.rstrip('/'))
+
+    if archive is None:
+        return [entry.name for entry in os.scandir(path) if entry.is_file()]
+
+    (tar, members) = open_archive(archive)
+    names = []
+    for membername in members:
+        (directory, _, filename) = membername.rpartition('/')
+        if name == "" or directory == name or directory.endswith('/' + name):
+            names.append(filename)
+
+    return names
+
+def open_log_binary(path):
+    '''
+    opens a log in binary mode, the log may be compressed or be a member of an archive
+
+    path - path to the log
+    '''
+
+    archive, member, filename = resolve(path)
+
+    if archive is not None:
+        (tar, members) = open_archive(archive)
+        return decompress(tar.extractfile(member), member.name)
+
+    if filename.endswith(".gz"):
+        return gzip.open(filename, 'rb')
+
+    return decompress(open(filename, 'rb'), filename)
+
+def open_log(path):
+    '''
+    opens a log in text mode, the log may be compressed or be a member of an archive
+
+    path - path to the log
+    '''
+
+    return io.TextIOWrapper(open_log_binary(path), errors="replace")
+
+def log_signature(path):
+    '''
+    returns the pair (size, modification time in nanoseconds) of a log
+
+    For members of an archive, the size of the member and the modification time of
+    the archive are returned.
+
+    path - path to the log
+    '''
+
+    archive, member, filename = resolve(path)
+
+    if archive is not None:
+        return member.size, os.stat(archive).st_mtime_ns
+
+    st = os.stat(filename)
+
+    return st.st_size, st.st_mtime_ns
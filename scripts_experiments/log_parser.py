@@ -0,0 +1,219 @@
+import json
+import log_files
+from records import InstanceRecord
+
+SOLVED = 0
+MEMORYLIMIT = 1
+TIMELIMIT = 2
+FAILED = 3
+
+# gap that is stored if SCIP reports an infinite gap
+INFINITE_GAP = 10000.0
+
+# beginning of the line printed by SCIP when the seed of a run is set
+SEED_PARAMETER = "randomization/permutationseed = "
+
+# beginning of the line written by run_experiments.py if a run ended without status, e.g., since the solver crashed
+FAILURE_PREFIX = "Run failed         : "
+
+# prefix of lines containing a symmetry structure as text
+SYMMETRY_PREFIX = "SYMMETRY "
+
+# prefix of lines containing a symmetry structure as JSON object
+SYMSTAT_PREFIX = "SYMSTAT "
+
+# types of the JSON objects printed by the patch, objects of other types are ignored
+SYMSTAT_TYPES = ["perms", "simplecut", "doublelexorbitope", "orbitope", "doublelex", "signedorbitope", "timing"]
+
+# fields of the JSON object of type "timing" containing the time spent in the phases of symmetry handling
+TIMING_FIELDS = ["graphwall", "graphcpu", "automorphismswall", "automorphismscpu", "detectionwall", "detectioncpu",
+                 "generationwall", "generationcpu"]
+
+class LogParser:
+    '''
+    Streaming parser for the logs of SCIP experiments as created by "make test".
+
+    The parser is fed line by line. Whenever the end of the log of an instance is
+    reached (marked by "@04"), the record of this instance is returned. A record
+    contains the seed of the run, the run statistics (status, time, gap, primal-dual
+    integral), and the symmetry information printed by the patched version of prop_symmetry.c.
+
+    The patch prints every symmetry structure both as text line ("SYMMETRY ...") and
+    as JSON object ("SYMSTAT {...}"). As soon as the first JSON object of an instance
+    is found, the information taken from text lines is discarded and only JSON objects
+    are used for the remaining log of the instance. Logs of older versions of the patch,
+    which only print text lines, are parsed from the text lines.
+    '''
+
+    def __init__(self, timelim=None):
+        '''
+        initializes the parser
+
+        timelim - time limit of the experiments (None if running times shall not be capped)
+        '''
+
+        self.timelim = timelim
+        self.record = None
+        self.structured = False
+
+    def feed(self, line):
+        '''
+        parses a single line of a log and returns the record of an instance if its log is complete
+
+        line - line of the log
+        '''
+
+        if line.startswith("@01"):
+            # a new instance is detected
+            self.record = InstanceRecord(line.split()[1].split('/')[-1], SOLVED)
+            self.structured = False
+            return None
+
+        stats = self.record
+        if stats is None:
+            return None
+
+        if line.startswith("@04"):
+            # the log of the instance is complete
+            self.record = None
+            stats.finalize()
+            return stats
+        elif line.startswith("SCIP Status        : solving was interrupted [memory limit reached]"):
+            stats.status = MEMORYLIMIT
+        elif line.startswith("SCIP Status        : solving was interrupted [time limit reached]"):
+            stats.status = TIMELIMIT
+        elif line.startswith(FAILURE_PREFIX):
+            stats.status = FAILED
+        elif line.startswith("Solving Time (sec)"):
+            if self.timelim is None:
+                stats.time = float(line.split()[-1])
+            elif stats.status in [MEMORYLIMIT, FAILED]:
+                stats.time = self.timelim
+            else:
+                stats.time = min(self.timelim, float(line.split()[-1]))
+        elif line.startswith("Gap                :"):
+            if line.split()[2] == "infinite":
+                stats.gap = INFINITE_GAP
+            else:
+                stats.gap = float(line.split()[2])
+        elif line.startswith("  primal-dual      :"):
+            stats.primaldual = float(line.strip().split()[2])
+        elif line.startswith(SEED_PARAMETER):
+            stats.seed = int(line[len(SEED_PARAMETER):])
+        elif line.startswith(SYMSTAT_PREFIX):
+            if not self.structured:
+                self.structured = True
+                stats.clear_symmetry()
+            parse_symmetry_record(stats, json.loads(line[len(SYMSTAT_PREFIX):]))
+        elif not self.structured and line.lstrip().startswith(SYMMETRY_PREFIX):
+            parse_symmetry_line(stats, line.strip())
+
+        return None
+
+def parse_symmetry_line(stats, sline):
+    '''
+    adds the information of a line printed by the patched version of prop_symmetry.c to a record
+
+    Lines of unknown symmetry structures are ignored.
+
+    stats - record of the instance
+    sline - stripped line starting with "SYMMETRY"
+    '''
+
+    if sline.startswith("SYMMETRY stats perms"):
+        ssline = sline.split()
+        stats.nperms = int(ssline[3])
+        stats.nsperms = int(ssline[5])
+    elif "simplecut" in sline:
+        stats.nsimple += 1
+    elif "doublelexorbitope" in sline:
+        ssline = sline.split()
+        stat = tuple([int(ssline[5]), int(ssline[7]), int(ssline[9])])
+        stats.sdoublelex.append(stat)
+    elif "orbitope dynamic" in sline:
+        ssline = sline.split()
+        stat = tuple([int(ssline[6]), int(ssline[8])])
+        stats.orbitope.append(stat)
+    elif "doublelex columnblocks" in sline:
+        ssline = sline.split()
+        stat = [int(ssline[5]), int(ssline[7])]
+        for i in range(stat[0]):
+            stat.append(int(ssline[9 + i]))
+        for i in range(stat[1]):
+            stat.append(int(ssline[9 + stat[0] + 1 + i]))
+        stat = tuple(stat)
+        stats.doublelex.append(stat)
+    elif "signedorbitope" in sline:
+        ssline = sline.split()
+        stat = tuple([int(ssline[5]), int(ssline[7])])
+        stats.sorbitope.append(stat)
+
+def parse_symmetry_record(stats, symstat):
+    '''
+    adds a symmetry structure printed as JSON object by the patched version of prop_symmetry.c to a record
+
+    Objects whose type is not in SYMSTAT_TYPES are ignored.
+
+    stats   - record of the instance
+    symstat - dictionary of the decoded JSON object
+    '''
+
+    kind = symstat.get("type")
+    if kind not in SYMSTAT_TYPES:
+        return
+
+    # time stamps are only printed by newer versions of the patch
+    if "time" in symstat:
+        if kind == "perms":
+            stats.symtime = symstat["time"]
+        else:
+            stats.handletime = max(stats.handletime, symstat["time"])
+
+    if kind == "perms":
+        stats.nperms = symstat["perms"]
+        stats.nsperms = symstat["signedperms"]
+    elif kind == "simplecut":
+        stats.nsimple += 1
+    elif kind == "doublelexorbitope":
+        stats.sdoublelex.append((symstat["rows"], symstat["columns"], symstat["signedrows"]))
+    elif kind == "orbitope":
+        stats.orbitope.append((symstat["rows"], symstat["columns"]))
+    elif kind == "doublelex":
+        colsizes = symstat["colsizes"]
+        rowsizes = symstat["rowsizes"]
+        stats.doublelex.append(tuple([len(colsizes), len(rowsizes)] + colsizes + rowsizes))
+        stats.doublelexwall += symstat.get("wall", 0.0)
+        stats.doublelexcpu += symstat.get("cpu", 0.0)
+    elif kind == "timing":
+        for field in TIMING_FIELDS:
+            setattr(stats, field, symstat.get(field, -1))
+    else:
+        stats.sorbitope.append((symstat["rows"], symstat["columns"]))
+
+def iterate_records(lines, timelim=None):
+    '''
+    generator of the records of all instances whose log is contained in an iterable of lines
+
+    lines   - iterable of lines of a log
+    timelim - time limit of the experiments (None if running times shall not be capped)
+    '''
+
+    parser = LogParser(timelim)
+
+    for line in lines:
+        record = parser.feed(line)
+        if record is not None:
+            yield record
+
+def parse_results_file(results_file, timelim=None):
+    '''
+    generator of the records of all instances in a file containing the SCIP results of a test set
+
+    The file may be compressed or be a member of an archive, see log_files.open_log.
+
+    results_file - path to file containing the SCIP results
+    timelim      - time limit of the experiments (None if running times shall not be capped)
+    '''
+
+    with log_files.open_log(results_file) as f:
+        yield from iterate_records(f, timelim)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+import argparse
+import numpy as np
+import aggregation
+import log_discovery
+from log_parser import SOLVED
+from records import average_seeds
+import results_cache
+
+# running times below this value are treated as this value when computing performance ratios
+MINTIME = 1.0
+
+# settings of the runs of the nonlinear test sets and their labels
+NONLINEAR_LABELS = [f"sym{i}" for i in range(7)] + ["automatic"]
+
+# settings of the runs of the benchmarking test sets, which are used as labels
+STANDARD_SETTINGS = [
+    "sym_0_doublelex_0_reflection_0_simple_0",
+    "sym_1_doublelex_0_reflection_0_simple_0",
+    "sym_1_doublelex_1_reflection_0_simple_0",
+    "sym_1_doublelex_1_reflection_1_simple_0",
+    "sym_1_doublelex_1_reflection_1_simple_1"
+]
+
+def instance_key(name):
+    '''
+    returns the name of an instance without the suffix encoding the symmetry handling method
+
+    For the generated instances, the logs of different methods are stored in different
+    test sets whose instances differ by their suffix, e.g., "elec_N10_D2_sym0.cip" and
+    "elec_N10_D2_sym3.cip" are the same instance.
+
+    name - name of the instance
+    '''
+
+    sname = name.split('_')
+    if len(sname) > 1 and sname[-1].startswith("sym"):
+        return '_'.join(sname[:-1])
+
+    return name
+
+def find_series(index, tnames, nonlinear, settings, host=None, binary=None):
+    '''
+    returns a dictionary mapping the label of each plotted curve to the list of pairs (test set, log) of its runs
+
+    index     - LogIndex of the directory containing results
+    tnames    - list of names of test sets
+    nonlinear - whether the test sets are generated test sets whose sym0, ..., sym6 variants shall be compared
+    settings  - for nonlinear test sets, the pair (settings of sym0, ..., sym6, settings of automatic symmetry
+                handling), otherwise the list of compared settings
+    host      - if not None, only logs created on this host are used
+    binary    - if not None, only logs created by this binary are used
+    '''
+
+    series = dict()
+
+    for label in (NONLINEAR_LABELS if nonlinear else settings):
+        series[label] = []
+        for tname in tnames:
+            if not nonlinear:
+                logs = index.find_logs(tname, label, host, binary)
+            elif label == "automatic":
+                logs = index.find_logs(f"{tname}_sym0", settings[1], host, binary)
+            else:
+                logs = index.find_logs(f"{tname}_{label}", settings[0], host, binary)
+            series[label] += [(tname, log) for log in logs]
+
+    return series
+
+def collect_times(series, records, nonlinear):
+    '''
+    returns the running times and solved flags of all curves on the instances that have been run by all of them
+
+    Returns a pair (times, solved) of arrays of shape (number of curves, number of instances).
+
+    series    - dictionary mapping the label of each curve to the list of pairs (test set, log) of its runs
+    records   - dictionary mapping each log to the list of its records
+    nonlinear - whether the runs of the curves belong to the sym0, ..., sym6 variants of generated test sets
+    '''
+
+    statistics = dict()
+    for label in series:
+        # runs of an instance with different seeds are averaged
+        statistics[label] = average_seeds(((tname, instance_key(record.name) if nonlinear else record.name), record)
+                                          for (tname, name) in series[label] for record in records[name])
+
+    labels = list(series)
+    instances = sorted(set.intersection(*(set(statistics[label]) for label in labels)))
+
+    (times, present) = aggregation.field_matrix(statistics, labels, instances, "time")
+    (status, present) = aggregation.field_matrix(statistics, labels, instances, "status")
+
+    return times, present & (status == SOLVED)
+
+def plot_performance_profile(times, solved, labels, filename, title, taumax=None):
+    '''
+    plots the performance profiles of several settings, i.e., the fraction of instances whose running time
+    is at most a factor tau of the best running time
+
+    times    - array of running times of shape (number of settings, number of instances)
+    solved   - boolean array of the same shape indicating solved instances
+    labels   - list of labels of the settings
+    filename - file to which the plot is written, its ending determines the format
+    title    - title of the plot
+    taumax   - largest factor shown (None if it shall be determined by the largest finite ratio)
+    '''
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    ratios = aggregation.performance_ratios(np.maximum(times, MINTIME), solved)
+    finite = ratios[np.isfinite(ratios)]
+    if taumax is None:
+        taumax = max(2.0, 1.1 * finite.max()) if finite.size > 0 else 2.0
+    taus = np.geomspace(1.0, taumax, 500)
+    fractions = aggregation.fraction_at_most(ratios, taus)
+
+    (fig, ax) = plt.subplots(figsize=(6, 4))
+    for (s, label) in enumerate(labels):
+        ax.step(taus, fractions[s], where="post", label=label)
+    ax.set_xscale("log")
+    ax.set_xlim(1.0, taumax)
+    ax.set_ylim(0.0, 1.02)
+    ax.set_xlabel("factor $\\tau$ of best running time")
+    ax.set_ylabel("fraction of instances")
+    ax.set_title(title)
+    ax.legend(loc="lower right", fontsize="small")
+    fig.tight_layout()
+    fig.savefig(filename)
+    plt.close(fig)
+
+def plot_solved_over_time(times, solved, labels, filename, title, timelim):
+    '''
+    plots for several settings the number of instances solved within a given time
+
+    times    - array of running times of shape (number of settings, number of instances)
+    solved   - boolean array of the same shape indicating solved instances
+    labels   - list of labels of the settings
+    filename - file to which the plot is written, its ending determines the format
+    title    - title of the plot
+    timelim  - time limit of the experiments
+    '''
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    (fig, ax) = plt.subplots(figsize=(6, 4))
+    for (s, label) in enumerate(labels):
+        solvedtimes = np.sort(np.maximum(times[s][solved[s]], MINTIME))
+        ax.step(np.concatenate(([MINTIME], solvedtimes, [timelim])),
+                np.concatenate(([0], np.arange(1, len(solvedtimes) + 1), [len(solvedtimes)])),
+                where="post", label=label)
+    ax.set_xscale("log")
+    ax.set_xlim(MINTIME, timelim)
+    ax.set_ylim(0, times.shape[1] + 1)
+    ax.set_xlabel("time in seconds")
+    ax.set_ylabel("number of solved instances")
+    ax.set_title(title)
+    ax.legend(loc="upper left", fontsize="small")
+    fig.tight_layout()
+    fig.savefig(filename)
+    plt.close(fig)
+
+def main(argv=None, prog=None):
+    '''
+    plots the running times of the test sets given on the command line
+
+    argv - list of command line arguments (None if the arguments of the script shall be used)
+    prog - name of the program shown in messages (None if the name of the script shall be used)
+    '''
+
+    # create a parser for arguments, options shared by all plots are defined in a parent parser
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('results', metavar='results', type=str, help='directory containing results')
+    common.add_argument('--tname', metavar='tname', type=str, action='append', required=True,
+                        help='name of test set to be added')
+    common.add_argument('--nonlinear', default=False, action='store_true',
+                        help='whether the sym0, ..., sym6 variants of generated test sets and automatic symmetry handling are compared')
+    common.add_argument('--settings', metavar='settings', type=str, action='append', default=None,
+                        help='name of compared settings, to be given once per curve (default: sym_*_doublelex_* settings)')
+    common.add_argument('--nosymsettings', metavar='nosymsettings', type=str, default="nosym_nonlinear",
+                        help='settings of the runs of the sym0, ..., sym6 test sets')
+    common.add_argument('--symsettings', metavar='symsettings', type=str, default="sym_nonlinear",
+                        help='settings of the run using automatic symmetry handling')
+    common.add_argument('--timelim', metavar='timelim', type=int, default=7200, help='time limit of experiments')
+    common.add_argument('--cache', metavar='cache', type=str, default=None,
+                        help='SQLite file caching parsed results (default: no cache)')
+    common.add_argument('--jobs', metavar='jobs', type=int, default=1, help='number of processes parsing results files')
+    common.add_argument('--host', metavar='host', type=str, default=None, help='only use logs created on this host')
+    common.add_argument('--binary', metavar='binary', type=str, default=None, help='only use logs created by this binary')
+    common.add_argument('--output', metavar='output', type=str, default=None,
+                        help='file to which the plot is written (default: <plot>_<testsets>.pdf)')
+
+    parser = argparse.ArgumentParser(prog=prog, description='plots the running times of several settings')
+    subparsers = parser.add_subparsers(dest='plot', required=True)
+    profile = subparsers.add_parser('profile', parents=[common], help='plot performance profiles')
+    profile.add_argument('--taumax', metavar='taumax', type=float, default=None, help='largest factor of the best running time shown')
+    subparsers.add_parser('solved', parents=[common], help='plot the number of instances solved over time')
+
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs needs to be positive")
+    if args.nonlinear and args.settings is not None:
+        parser.error("--settings cannot be combined with --nonlinear, use --nosymsettings and --symsettings instead")
+
+    settings = (args.nosymsettings, args.symsettings) if args.nonlinear else \
+        (STANDARD_SETTINGS if args.settings is None else args.settings)
+
+    try:
+        series = find_series(log_discovery.LogIndex(args.results), args.tname, args.nonlinear, settings,
+                             args.host, args.binary)
+    except (FileNotFoundError, ValueError) as e:
+        parser.error(str(e))
+
+    # parse all files at once, possibly in parallel
+    records = results_cache.load_records([name for label in series for (tname, name) in series[label]],
+                                         args.timelim, args.cache, args.jobs)
+    (times, solved) = collect_times(series, records, args.nonlinear)
+
+    labels = list(series)
+    title = ", ".join(args.tname)
+    filename = f"{args.plot}_{'_'.join(args.tname)}.pdf" if args.output is None else args.output
+
+    if args.plot == "profile":
+        plot_performance_profile(times, solved, labels, filename, title, args.taumax)
+    else:
+        plot_solved_over_time(times, solved, labels, filename, title, args.timelim)
+
+    print(f"plotted {times.shape[1]} instances of {len(labels)} settings to {filename}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+import copy
+import csv
+import os
+import pickle
+import sys
+
+# fields of a record that contain a single number
+NUMERIC_FIELDS = ["seed", "status", "time", "gap", "primaldual", "nperms", "nsperms", "nsimple",
+                  "symtime", "handletime", "doublelexwall", "doublelexcpu", "graphwall", "graphcpu",
+                  "automorphismswall", "automorphismscpu", "detectionwall", "detectioncpu",
+                  "generationwall", "generationcpu"]
+
+# fields of a record that are averaged over the runs of an instance with different seeds
+AVERAGED_FIELDS = ["time", "gap", "primaldual"]
+
+# fields of a record that contain a sequence of symmetry structures
+STRUCTURE_FIELDS = ["sdoublelex", "orbitope", "doublelex", "sorbitope"]
+
+# ending of files storing records that have been collected without writing a log
+RECORDS_ENDING = ".records"
+
+class InstanceRecord:
+    '''
+    Compact record containing the information about the run of a single instance.
+
+    The record stores the seed of the run (the value of randomization/permutationseed,
+    0 if it has not been changed), the run statistics (status, time, gap, primal-dual
+    integral) and the symmetry structures printed by the patched version of prop_symmetry.c.
+    If the patch prints JSON records, the record also contains the solving time at
+    which the symmetries have been computed (symtime) and at which the last symmetry
+    structure has been handled (handletime) as well as the wall clock and CPU time
+    spent on generating the constraints of row and column symmetries. Newer versions of
+    the patch also report the wall clock and CPU time spent on constructing the symmetry
+    detection graph, computing its automorphisms, detecting lex matrices, and generating
+    the constraints of all orbitopes and lex matrices (-1 if unknown).
+    Names of instances are interned such that records of different settings share
+    their name. While a log is parsed, structures are collected in lists, which are
+    replaced by tuples once the record is finalized.
+    '''
+
+    __slots__ = ["name"] + NUMERIC_FIELDS + STRUCTURE_FIELDS
+
+    def __init__(self, name, status=0, seed=0):
+        '''
+        initializes the record of an instance before any line of its log has been parsed
+
+        name   - name of the instance
+        status - initial status of the run
+        seed   - seed of the run
+        '''
+
+        self.name = sys.intern(name)
+        self.seed = seed
+        self.status = status
+        self.time = -1
+        self.gap = -1
+        self.primaldual = -1
+        self.clear_symmetry()
+
+    def __getstate__(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __setstate__(self, state):
+        if len(state) != len(self.__slots__):
+            raise ValueError("record has been stored with a different set of fields")
+
+        for (field, value) in zip(self.__slots__, state):
+            setattr(self, field, value)
+
+        # names are not interned by pickle
+        self.name = sys.intern(self.name)
+
+    def clear_symmetry(self):
+        '''
+        forgets all symmetry information of the record
+        '''
+
+        self.nperms = -1
+        self.nsperms = -1
+        self.nsimple = 0
+        self.symtime = -1
+        self.handletime = -1
+        self.doublelexwall = 0.0
+        self.doublelexcpu = 0.0
+        self.graphwall = -1
+        self.graphcpu = -1
+        self.automorphismswall = -1
+        self.automorphismscpu = -1
+        self.detectionwall = -1
+        self.detectioncpu = -1
+        self.generationwall = -1
+        self.generationcpu = -1
+        self.sdoublelex = []
+        self.orbitope = []
+        self.doublelex = []
+        self.sorbitope = []
+
+    def finalize(self):
+        '''
+        replaces the lists of symmetry structures by tuples
+        '''
+
+        self.sdoublelex = tuple(self.sdoublelex)
+        self.orbitope = tuple(self.orbitope)
+        self.doublelex = tuple(self.doublelex)
+        self.sorbitope = tuple(self.sorbitope)
+
+    @property
+    def nsdoublelex(self):
+        '''
+        number of detected signed row and column symmetries
+        '''
+
+        return len(self.sdoublelex)
+
+    @property
+    def norbitope(self):
+        '''
+        number of detected row symmetries
+        '''
+
+        return len(self.orbitope)
+
+    @property
+    def ndoublelex(self):
+        '''
+        number of detected row and column symmetries
+        '''
+
+        return len(self.doublelex)
+
+    @property
+    def nsorbitope(self):
+        '''
+        number of detected signed row symmetries
+        '''
+
+        return len(self.sorbitope)
+
+def mean_record(records):
+    '''
+    returns a record summarizing the runs of an instance with different seeds
+
+    The fields in AVERAGED_FIELDS contain the arithmetic means over all runs, i.e., the
+    running time of the instance is the mean of its running times before it enters a
+    shifted geometric mean. The status is the largest status of the runs, i.e., the
+    instance counts as solved only if it has been solved for all seeds. All other fields,
+    in particular the symmetry structures, are taken from the first run. A single run is
+    returned unchanged.
+
+    records - nonempty list of records of the same instance
+    '''
+
+    if len(records) == 1:
+        return records[0]
+
+    record = copy.copy(records[0])
+    record.status = max(run.status for run in records)
+    for field in AVERAGED_FIELDS:
+        setattr(record, field, sum(getattr(run, field) for run in records) / len(records))
+
+    return record
+
+def average_seeds(keyed_records):
+    '''
+    returns a dictionary mapping keys of instances to records, averaging the runs of different seeds
+
+    Records are grouped by their key and their seed. If a key occurs several times with
+    the same seed, the last record is used. The runs of the different seeds of a key are
+    then combined by mean_record.
+
+    keyed_records - iterable of pairs (key, record), where the key identifies the instance, e.g., its name
+    '''
+
+    runs = dict()
+
+    for (key, record) in keyed_records:
+        runs.setdefault(key, dict())[record.seed] = record
+
+    return {key: mean_record(list(runs[key].values())) for key in runs}
+
+def encode_structures(structures):
+    '''
+    encodes a sequence of symmetry structures as a string, e.g., ((4, 3, 2), (5, 2)) as "4:3:2;5:2"
+
+    structures - sequence of tuples of integers
+    '''
+
+    return ";".join(":".join(str(entry) for entry in structure) for structure in structures)
+
+def write_records(records, filename):
+    '''
+    stores a sequence of records in a file, which can be passed to the evaluation scripts instead of a log
+
+    The file is replaced atomically, i.e., readers either see the old or the new records.
+
+    records  - sequence of records
+    filename - path to the file, should end with RECORDS_ENDING
+    '''
+
+    tmpname = filename + ".tmp"
+    with open(tmpname, 'wb') as f:
+        pickle.dump(list(records), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmpname, filename)
+
+def read_records(filename):
+    '''
+    returns the list of records stored in a file by write_records
+
+    filename - path to the file
+    '''
+
+    with open(filename, 'rb') as f:
+        return pickle.load(f)
+
+def to_columns(records):
+    '''
+    returns a dictionary mapping each field to the list of its values in a sequence of records
+
+    Symmetry structures are encoded by encode_structures.
+
+    records - sequence of records
+    '''
+
+    columns = {"name": [record.name for record in records]}
+
+    for field in NUMERIC_FIELDS:
+        columns[field] = [getattr(record, field) for record in records]
+    for field in STRUCTURE_FIELDS:
+        columns[field] = [encode_structures(getattr(record, field)) for record in records]
+
+    return columns
+
+def export_csv(records, filename, extra=None):
+    '''
+    writes a sequence of records to a CSV file
+
+    records  - sequence of records
+    filename - path to the CSV file
+    extra    - dictionary mapping names of additional columns to lists of values (e.g., the setting)
+    '''
+
+    columns = dict() if extra is None else dict(extra)
+    columns.update(to_columns(records))
+
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns.keys())
+        writer.writerows(zip(*columns.values()))
+
+def export_parquet(records, filename, extra=None):
+    '''
+    writes a sequence of records to a Parquet file, requires the Python package pyarrow
+
+    records  - sequence of records
+    filename - path to the Parquet file
+    extra    - dictionary mapping names of additional columns to lists of values (e.g., the setting)
+    '''
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("exporting records to Parquet requires the Python package pyarrow")
+
+    columns = dict() if extra is None else dict(extra)
+    columns.update(to_columns(records))
+
+    pyarrow.parquet.write_table(pyarrow.table(columns), filename)
@@ -0,0 +1,230 @@
+import contextlib
+import hashlib
+import io
+import multiprocessing
+import os
+import pickle
+import sqlite3
+import log_files
+import log_parser
+from records import RECORDS_ENDING, read_records
+
+# needs to be increased whenever the structure of the records changes
+CACHE_VERSION = 6
+
+def open_cache(cache_file):
+    '''
+    opens the cache and creates its table if it does not exist yet
+
+    cache_file - path to the SQLite file of the cache
+    '''
+
+    connection = sqlite3.connect(cache_file)
+    connection.execute("CREATE TABLE IF NOT EXISTS records ("
+                       "path TEXT, timelim REAL, version INTEGER, size INTEGER, mtime INTEGER, digest TEXT, "
+                       "records BLOB, PRIMARY KEY (path, timelim))")
+
+    return connection
+
+def hashed_lines(f, digest):
+    '''
+    generator of the decoded lines of a binary file that updates a hash with the raw content
+
+    f      - file opened in binary mode
+    digest - hash object that is updated
+    '''
+
+    for line in f:
+        digest.update(line)
+        yield line.decode(errors="replace")
+
+def file_digest(results_file):
+    '''
+    returns the SHA-256 hash of the (decompressed) content of a log
+
+    results_file - path to the log
+    '''
+
+    digest = hashlib.sha256()
+
+    with log_files.open_log_binary(results_file) as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+def lookup_records(connection, path, key, size, mtime):
+    '''
+    returns the cached records of a log or None if the log changed since it has been cached
+
+    A log is considered unchanged if its size and modification time coincide with the
+    cached values or, if only the modification time differs, if the hash of its content
+    coincides with the cached hash.
+
+    connection - connection to the cache
+    path       - absolute path to the log
+    key        - time limit used to parse the log (-1 if running times are not capped)
+    size       - current size of the log
+    mtime      - current modification time of the log in nanoseconds
+    '''
+
+    row = connection.execute("SELECT version, size, mtime, digest, records FROM records WHERE path = ? AND timelim = ?",
+                             (path, key)).fetchone()
+
+    if row is None or row[0] != CACHE_VERSION or row[1] != size:
+        return None
+
+    if row[2] == mtime:
+        return pickle.loads(row[4])
+
+    # the file has been touched, check whether its content changed
+    if row[3] == file_digest(path):
+        with connection:
+            connection.execute("UPDATE records SET mtime = ? WHERE path = ? AND timelim = ?", (mtime, path, key))
+        return pickle.loads(row[4])
+
+    return None
+
+def parse_stream(f, timelim):
+    '''
+    parses a log and computes the hash of its content in the same pass
+
+    Returns the pair (records, hash).
+
+    f       - (decompressed) log opened in binary mode
+    timelim - time limit of the experiments (None if running times shall not be capped)
+    '''
+
+    digest = hashlib.sha256()
+    records = list(log_parser.iterate_records(hashed_lines(f, digest), timelim))
+
+    return records, digest.hexdigest()
+
+def parse_with_digest(path, timelim):
+    '''
+    parses a log given by its path, see parse_stream
+
+    path    - path to the log
+    timelim - time limit of the experiments (None if running times shall not be capped)
+    '''
+
+    with log_files.open_log_binary(path) as f:
+        return parse_stream(f, timelim)
+
+def parse_content(content, timelim):
+    '''
+    parses a log given by its (decompressed) content, see parse_stream
+
+    content - content of the log as bytes
+    timelim - time limit of the experiments (None if running times shall not be capped)
+    '''
+
+    return parse_stream(io.BytesIO(content), timelim)
+
+def parse_logs(paths, timelim, njobs):
+    '''
+    returns a dictionary mapping paths to logs to the pairs (records, hash) of these logs
+
+    Logs stored as files are parsed by a pool of processes. Each archive containing
+    logs is read in a single streaming pass by this process, which hands the content
+    of its members to the pool, such that the archive is neither decompressed more
+    than once nor opened by the processes of the pool.
+
+    paths   - list of paths to logs
+    timelim - time limit of the experiments (None if running times shall not be capped)
+    njobs   - number of processes parsing logs
+    '''
+
+    files = []
+    archives = dict()
+    for path in paths:
+        (archive, member, _) = log_files.resolve(path)
+        if archive is None:
+            files.append(path)
+        else:
+            archives.setdefault(archive, dict())[member.name] = path
+
+    parsed = dict()
+    usepool = njobs > 1 and len(paths) > 1
+    with multiprocessing.Pool(processes=min(njobs, len(paths))) if usepool else contextlib.nullcontext() as pool:
+        for path in files:
+            if pool is None:
+                parsed[path] = parse_with_digest(path, timelim)
+            else:
+                parsed[path] = pool.apply_async(parse_with_digest, (path, timelim))
+
+        for (archive, members) in archives.items():
+            for (name, f) in log_files.iterate_members(archive, members):
+                if pool is None:
+                    parsed[members[name]] = parse_stream(f, timelim)
+                else:
+                    parsed[members[name]] = pool.apply_async(parse_content, (f.read(), timelim))
+
+        if pool is not None:
+            parsed = {path: result.get() for (path, result) in parsed.items()}
+
+    return parsed
+
+def load_records(results_files, timelim=None, cache_file=None, njobs=1):
+    '''
+    returns a dictionary mapping each file containing SCIP results to the list of records of its instances
+
+    The files may be compressed or be members of an archive, see log_files.open_log.
+    If a cache is given, the records of files that did not change since they have been
+    parsed last are taken from the cache, see lookup_records. All other files are parsed
+    concurrently by a pool of processes, see parse_logs. Files ending with RECORDS_ENDING
+    already contain records and are read directly.
+
+    results_files - list of paths to files containing SCIP results
+    timelim       - time limit of the experiments (None if running times shall not be capped)
+    cache_file    - path to the SQLite file of the cache (None if no cache shall be used)
+    njobs         - number of processes parsing files
+    '''
+
+    key = -1.0 if timelim is None else float(timelim)
+    paths = {results_file: os.path.abspath(results_file) for results_file in results_files}
+
+    records = dict()
+    for path in set(paths.values()):
+        if path.endswith(RECORDS_ENDING):
+            records[path] = read_records(path)
+
+    signatures = {path: log_files.log_signature(path) for path in set(paths.values()) if path not in records}
+
+    connection = None if cache_file is None else open_cache(cache_file)
+    try:
+        if connection is not None:
+            for path in signatures:
+                cached = lookup_records(connection, path, key, *signatures[path])
+                if cached is not None:
+                    records[path] = cached
+
+        missing = [path for path in signatures if path not in records]
+        for (path, (parsed, digest)) in parse_logs(missing, timelim, njobs).items():
+            records[path] = parsed
+            if connection is not None:
+                (size, mtime) = signatures[path]
+                with connection:
+                    connection.execute("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                       (path, key, CACHE_VERSION, size, mtime, digest,
+                                        pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL)))
+    finally:
+        if connection is not None:
+            connection.close()
+
+    return {results_file: records[paths[results_file]] for results_file in results_files}
+
+def get_records(results_file, timelim=None, cache_file=None):
+    '''
+    returns the list of records of all instances in a file containing SCIP results
+
+    The file may be compressed or be a member of an archive, see log_files.open_log.
+    If a cache is given, the records are taken from the cache if the file has not changed
+    since it has been parsed last, see lookup_records.
+
+    results_file - path to file containing the SCIP results
+    timelim      - time limit of the experiments (None if running times shall not be capped)
+    cache_file   - path to the SQLite file of the cache (None if no cache shall be used)
+    '''
+
+    return load_records([results_file], timelim, cache_file)[results_file]
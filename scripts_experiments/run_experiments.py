@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+
+import argparse
+import concurrent.futures
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+import log_discovery
+import results_cache
+import run_journal
+from log_parser import FAILURE_PREFIX
+
+# directories of this project containing test sets and settings
+BASEDIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTSETDIR = os.path.join(BASEDIR, "testset")
+SETTINGSDIR = os.path.join(BASEDIR, "settings")
+
+def read_testset(testfile):
+    '''
+    returns the list of instances of a test set
+
+    testfile - path to a .test file containing one path to an instance per line
+    '''
+
+    instances = []
+
+    f = open(testfile, 'r')
+    for line in f:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            instances.append(line)
+    f.close()
+
+    return instances
+
+def find_file(name, directory, ending):
+    '''
+    returns the path to a test set or settings file given either by its path or its name
+
+    name      - path to the file or name of the file without ending
+    directory - directory in which files given by their name are searched
+    ending    - ending of the file, e.g., ".test"
+    '''
+
+    if os.path.isfile(name):
+        return name
+
+    return os.path.join(directory, name + ending)
+
+def hard_limits(timelim, memlim):
+    '''
+    returns the limits (in seconds and megabytes) after which a solver process is killed
+
+    The solver is expected to respect the time and memory limit itself. The hard
+    limits leave some slack such that a solver can terminate gracefully.
+
+    timelim - time limit in seconds
+    memlim  - memory limit in megabytes
+    '''
+
+    return timelim + timelim / 10 + 10, memlim + memlim / 10 + 100
+
+def start_solver(command, hardmemlim, stderr=subprocess.STDOUT):
+    '''
+    starts a solver whose output is read from a pipe and limits its address space
+
+    The limit is set by prlimit after the solver has been started instead of by a
+    function executed in the child process before the solver is started, since the
+    latter may deadlock if the parent process runs several threads.
+
+    command    - list of arguments of the command of the solver
+    hardmemlim - limit in megabytes
+    stderr     - destination of the error output of the solver
+    '''
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+
+    limit = int(hardmemlim * 1024 * 1024)
+    try:
+        resource.prlimit(process.pid, resource.RLIMIT_AS, (limit, limit))
+    except ProcessLookupError:
+        # the solver already terminated
+        pass
+
+    return process
+
+def solver_commands(instance, settingsfile, timelim, memlim, seed=0, presolveonly=False):
+    '''
+    returns the interactive shell commands executed by SCIP to solve an instance
+
+    For a positive seed, the variables of the instance are permuted using this seed;
+    SCIP then prints the seed parameter to the log.
+
+    instance     - path to the instance
+    settingsfile - path to the settings file (None for default settings)
+    timelim      - time limit in seconds
+    memlim       - memory limit in megabytes
+    seed         - seed of the permutation of the instance (0 if the instance is not permuted)
+    presolveonly - whether SCIP shall stop after presolving
+    '''
+
+    commands = []
+    if settingsfile is not None:
+        commands.append(f"set load {settingsfile}")
+    if seed > 0:
+        commands += [
+            f"set randomization permutationseed {seed}",
+            "set randomization permutevars TRUE"
+            ]
+    commands += [
+        f"set limits time {timelim}",
+        f"set limits memory {memlim}",
+        "set timing clocktype 1",
+        "set display freq 10000",
+        f"read {instance}"
+        ]
+    if presolveonly:
+        commands.append("presolve")
+    else:
+        commands += ["optimize", "display statistics"]
+    commands.append("quit")
+
+    return commands
+
+def run_job(solver, instance, settingsfile, timelim, memlim, seed=0):
+    '''
+    runs the solver on an instance and returns the pair (output, start and end time)
+
+    The solver is killed if it exceeds the hard time or memory limit. If the run ends
+    without status, e.g., since it has been killed or the solver crashed, the output
+    is extended by a failure report, see failure_report.
+
+    solver       - path to the solver executable
+    instance     - path to the instance
+    settingsfile - path to the settings file (None for default settings)
+    timelim      - time limit in seconds
+    memlim       - memory limit in megabytes
+    seed         - seed of the permutation of the instance (0 if the instance is not permuted)
+    '''
+
+    (hardtimelim, hardmemlim) = hard_limits(timelim, memlim)
+    command = [solver, "-c", " ".join(solver_commands(instance, settingsfile, timelim, memlim, seed))]
+
+    start = time.time()
+    process = start_solver(command, hardmemlim)
+    try:
+        (stdout, _) = process.communicate(timeout=hardtimelim)
+        output = stdout.decode(errors="replace")
+        if process.returncode != 0:
+            failure = f"solver terminated with exit code {process.returncode}"
+        elif not has_status(output):
+            failure = "solver terminated without status"
+        else:
+            failure = None
+    except subprocess.TimeoutExpired:
+        process.kill()
+        (stdout, _) = process.communicate()
+        output = stdout.decode(errors="replace")
+        failure = f"solver killed after exceeding the hard time limit of {hardtimelim:.0f} seconds"
+    end = time.time()
+
+    if failure is not None:
+        output += failure_report(failure, timelim)
+
+    return output, (start, end)
+
+def has_status(output):
+    '''
+    returns whether the output of a solver run contains the status reported by SCIP
+
+    output - output of the solver
+    '''
+
+    return output.startswith("SCIP Status") or "\nSCIP Status" in output
+
+def failure_report(reason, timelim):
+    '''
+    returns the lines appended to the output of a run that ended without status
+
+    The lines mark the run as failed, see log_parser.FAILED, and report the time limit
+    as its running time, such that the run counts as unsolved in all evaluations.
+
+    reason  - description of the failure
+    timelim - time limit in seconds
+    '''
+
+    return f"\n{FAILURE_PREFIX}{reason}\nSolving Time (sec) : {timelim:.2f}\n"
+
+def write_block(f, instance, output, start, end):
+    '''
+    writes the output of a solver run to a log in the format of SCIP's "make test"
+
+    f        - stream of the log
+    instance - path to the instance
+    output   - output of the solver
+    start    - time stamp of the start of the run
+    end      - time stamp of the end of the run
+    '''
+
+    f.write(f"@01 {instance} ===========\n")
+    f.write("-----------------------------\n")
+    f.write(time.ctime(start) + "\n")
+    f.write("-----------------------------\n")
+    f.write(f"@03 {int(start)}\n")
+    f.write(output)
+    if not output.endswith("\n"):
+        f.write("\n")
+    f.write(f"@04 {int(end)}\n")
+    f.write("-----------------------------\n")
+    f.write(time.ctime(end) + "\n")
+    f.write("-----------------------------\n")
+    f.write("=ready=\n")
+    f.flush()
+
+def expected_times(results, testset, timelim):
+    '''
+    returns a dictionary mapping instances to their running time in earlier runs of a test set
+
+    If an instance has been solved with several settings, the largest running time is used.
+
+    results - directory containing results of earlier runs
+    testset - name of the test set
+    timelim - time limit of the experiments
+    '''
+
+    times = dict()
+
+    if not os.path.isdir(results):
+        return times
+
+    entries = log_discovery.LogIndex(results).select(testset=testset)
+    records = results_cache.load_records([entry["path"] for entry in entries], timelim)
+    for path in records:
+        for record in records[path]:
+            times[record.name] = max(times.get(record.name, 0.0), record.time)
+
+    return times
+
+def order_jobs(jobs, expected, timelim):
+    '''
+    sorts jobs such that jobs with the longest expected running time are started first
+
+    Instances without earlier runs are expected to hit the time limit; ties are broken
+    by preferring larger instance files.
+
+    jobs     - list of tuples (instance path, (test set, settings name), settings file, seed)
+    expected - dictionary mapping pairs (test set, instance name) to their expected running time
+    timelim  - time limit of the experiments
+    '''
+
+    def key(job):
+        instance = job[0]
+        size = os.path.getsize(instance) if os.path.exists(instance) else 0
+        return (-expected.get((job[1][0], os.path.basename(instance)), timelim), -size)
+
+    return sorted(jobs, key=key)
+
+def main(argv=None, prog=None):
+    '''
+    runs the experiments given on the command line
+
+    argv - list of command line arguments (None if the arguments of the script shall be used)
+    prog - name of the program shown in messages (None if the name of the script shall be used)
+    '''
+
+    # create a parser for arguments
+    parser = argparse.ArgumentParser(prog=prog, description='runs a solver on test sets with several settings in parallel')
+    parser.add_argument('solver', metavar='solver', type=str, help='path to the solver executable')
+    parser.add_argument('--tname', metavar='tname', type=str, action='append', required=True,
+                        help='name of test set in directory testset or path to a .test file')
+    parser.add_argument('--settings', metavar='settings', type=str, action='append', default=None,
+                        help='name of settings in directory settings, path to a .set file, or "default"')
+    parser.add_argument('--checkdir', metavar='checkdir', type=str, default=".",
+                        help='directory relative to which the paths in .test files are given')
+    parser.add_argument('--results', metavar='results', type=str, default="results", help='directory to store logs')
+    parser.add_argument('--timelim', metavar='timelim', type=int, default=7200, help='time limit per instance in seconds')
+    parser.add_argument('--memlim', metavar='memlim', type=int, default=50000, help='memory limit per instance in megabytes')
+    parser.add_argument('--jobs', metavar='jobs', type=int, default=1, help='number of instances solved in parallel')
+    parser.add_argument('--host', metavar='host', type=str, default=socket.gethostname().split('.')[0],
+                        help='name of host used in names of logs')
+    parser.add_argument('--binary', metavar='binary', type=str, default=None,
+                        help='name of binary used in names of logs (default: name of solver executable)')
+    parser.add_argument('--seeds', metavar='seeds', type=int, default=1,
+                        help='number of runs per instance and settings, run k > 0 permutes the instance with seed k')
+    parser.add_argument('--resume', default=False, action='store_true',
+                        help='whether existing logs shall be continued by the runs that are missing or crashed')
+
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1:
+        parser.error("--jobs needs to be positive")
+    if args.seeds < 1:
+        parser.error("--seeds needs to be positive")
+
+    binary = os.path.basename(args.solver) if args.binary is None else args.binary
+    settings = ["default"] if args.settings is None else args.settings
+    os.makedirs(args.results, exist_ok=True)
+
+    # collect the jobs of all test sets and settings
+    jobs = []
+    logs = dict()
+    expected = dict()
+    nskipped = 0
+    for tname in args.tname:
+        testfile = find_file(tname, TESTSETDIR, ".test")
+        testset = os.path.basename(testfile)[:-len(".test")]
+        for (name, runtime) in expected_times(args.results, testset, args.timelim).items():
+            expected[testset, name] = runtime
+
+        for sett in settings:
+            settingsfile = None if sett == "default" else find_file(sett, SETTINGSDIR, ".set")
+            settingsname = "default" if settingsfile is None else os.path.basename(settingsfile)[:-len(".set")]
+
+            logname = os.path.join(args.results, f"check.{testset}.{binary}.{args.host}.{settingsname}.out")
+            if args.resume:
+                completed = run_journal.prepare_resume(logname)
+                logs[testset, settingsname] = open(logname, 'a')
+            else:
+                completed = set()
+                logs[testset, settingsname] = open(logname, 'w')
+
+            for instance in read_testset(testfile):
+                for seed in range(args.seeds):
+                    if (os.path.basename(instance), seed) in completed:
+                        nskipped += 1
+                        continue
+                    jobs.append((os.path.join(args.checkdir, instance), (testset, settingsname), settingsfile, seed))
+
+    # the longest jobs of all test sets are started first
+    jobs = order_jobs(jobs, expected, args.timelim)
+
+    if nskipped > 0:
+        print(f"skipping {nskipped} completed runs")
+
+    # solve all instances, logs are written whenever a job is finished
+    failed = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {executor.submit(run_job, args.solver, instance, settingsfile, args.timelim, args.memlim, seed):
+                   (instance, log, seed) for (instance, log, settingsfile, seed) in jobs}
+
+        for (cnt, future) in enumerate(concurrent.futures.as_completed(futures)):
+            (instance, log, seed) = futures[future]
+            try:
+                (output, (start, end)) = future.result()
+            except OSError as e:
+                print(f"[{cnt+1}/{len(jobs)}] FAILED {instance} ({log[1]}, seed {seed}): {e}", file=sys.stderr)
+                failed += 1
+                continue
+
+            write_block(logs[log], instance, output, start, end)
+            print(f"[{cnt+1}/{len(jobs)}] finished {instance} ({log[1]}, seed {seed}) after {end - start:.1f}s")
+
+    for f in logs.values():
+        f.close()
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+from log_parser import FAILURE_PREFIX, SEED_PARAMETER
+
+# the journal is scanned without decoding the log
+SEED_LINE = SEED_PARAMETER.encode()
+FAILURE_LINE = FAILURE_PREFIX.encode()
+
+def scan_log(path):
+    '''
+    returns the journal of a log, i.e., the runs it contains and where it can be continued
+
+    Returns a pair (completed, end). completed is the set of pairs (instance, seed) of
+    runs whose log is complete, i.e., the run reached its "@04" marker and SCIP reported
+    its status. Runs without status or marked as failed by run_experiments.py crashed or
+    have been killed. end is the size of the log without the output of a trailing run
+    that has not reached its "@04" marker, i.e., a run that was interrupted while its
+    log has been written. Runs without seed parameter in their log are reported with
+    seed 0.
+
+    path - path to the log
+    '''
+
+    completed = set()
+
+    if not os.path.exists(path):
+        return completed, 0
+
+    instance = None
+    offset = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            start = offset
+            offset += len(line)
+
+            if line.startswith(b"@01"):
+                # a new run is detected
+                begin = start
+                instance = line.split()[1].decode(errors="replace").split('/')[-1]
+                seed = 0
+                status = False
+            elif instance is None:
+                continue
+            elif line.startswith(b"@04"):
+                if status:
+                    completed.add((instance, seed))
+                instance = None
+            elif line.startswith(b"SCIP Status"):
+                status = True
+            elif line.startswith(FAILURE_LINE):
+                status = False
+            elif line.startswith(SEED_LINE):
+                seed = int(line[len(SEED_LINE):])
+
+    if instance is not None:
+        return completed, begin
+
+    return completed, offset
+
+def prepare_resume(path):
+    '''
+    returns the set of pairs (instance, seed) of completed runs in a log and removes incomplete trailing output
+
+    path - path to the log
+    '''
+
+    completed, end = scan_log(path)
+
+    if os.path.exists(path) and os.path.getsize(path) > end:
+        os.truncate(path, end)
+
+    return completed
@@ -0,0 +1,328 @@
+import gzip
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+from itertools import islice
+
+# supported compressions of files and the endings they append to the file names
+COMPRESSION_ENDINGS = {"gz": ".gz", "zst": ".zst"}
+
+# number of lines that are joined at once by CIPWriter.write_lines
+LINES_PER_CHUNK = 4096
+
+def open_compressed(name, compression):
+    '''
+    opens a compressed file for writing text
+
+    name        - path to the file
+    compression - compression of the file, i.e., a key of COMPRESSION_ENDINGS
+    '''
+
+    if compression == "gz":
+        return gzip.open(name, 'wt', compresslevel=6)
+
+    assert compression == "zst"
+
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("writing zstd-compressed files requires the Python package zstandard")
+
+    return zstandard.open(name, 'wt')
+
+def format_number(value):
+    '''
+    returns the shortest string representation of a number, integral numbers are written without decimal point
+
+    value - the number
+    '''
+
+    if type(value) is int:
+        return str(value)
+
+    if math.isinf(value):
+        return "+inf" if value > 0 else "-inf"
+
+    if float(value).is_integer():
+        return str(int(value))
+
+    return repr(float(value))
+
+def variable_line(vartype, name, obj, lb, ub):
+    '''
+    returns the line defining a variable
+
+    vartype - type of the variable, e.g., "continuous" or "binary"
+    name    - name of the variable
+    obj     - objective coefficient of the variable
+    lb      - string representation of lower bound of the variable
+    ub      - string representation of upper bound of the variable
+    '''
+
+    return f"  [{vartype}] <{name}>: obj={obj}, original bounds=[{lb},{ub}]"
+
+def constraint_line(constype, name, expression):
+    '''
+    returns the line defining a constraint
+
+    constype   - type of the constraint, e.g., "linear" or "nonlinear"
+    name       - name of the constraint
+    expression - expression encoding the constraint including its right-hand side
+    '''
+
+    return f"  [{constype}] <{name}>: {expression};"
+
+class CIPWriter:
+    '''
+    Buffered writer for files in CIP format.
+
+    The writer can also be used for any other text format, e.g., by the writers of
+    osil_writer and lp_writer.
+
+    Lines of the file are collected in a list and only written to the underlying
+    file if the buffered text exceeds a given size or if the writer is flushed or
+    closed. This avoids issuing a separate write for each term of a constraint.
+
+    The file can be compressed by gzip or zstd (the latter requires the Python package
+    zstandard). SCIP reads gzip-compressed files directly, but not zstd-compressed ones,
+    which need to be decompressed before they can be solved. Alternatively, the model
+    can be streamed into a solver without creating a CIP file: the solver reads the
+    model from a pipe connected to its standard input, which it accesses via a symbolic
+    link with the name of the CIP file, and its output is written to a log instead.
+    The attribute name contains the path of the file that is created, i.e., the
+    (compressed) CIP file or the log of the solver.
+    '''
+
+    def __init__(self, name, bufsize=1 << 20, compression=None, solver=None):
+        '''
+        opens a CIP file for writing
+
+        name        - path to the CIP file
+        bufsize     - number of buffered characters after which the buffer is written to the file
+        compression - compression of the file, i.e., a key of COMPRESSION_ENDINGS (None if the file shall not be compressed)
+        solver      - list of arguments of the command of a solver to which "-f <CIP file>" is appended and which
+                      reads the model instead of a file (None if the model shall be written to a file)
+        '''
+
+        assert compression is None or solver is None
+
+        self.name = name
+        self.bufsize = bufsize
+        self.buffer = []
+        self.buffered = 0
+        self.process = None
+
+        if solver is not None:
+            self.f = self.open_solver(solver)
+        elif compression is None:
+            self.f = open(name, 'w')
+        else:
+            self.name = name + COMPRESSION_ENDINGS[compression]
+            self.f = open_compressed(self.name, compression)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, text):
+        '''
+        appends text to the buffer
+
+        text - text to be written
+        '''
+
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.bufsize:
+            self.flush()
+
+    def write_lines(self, lines):
+        '''
+        appends lines to the buffer, a line break is added after each line
+
+        lines - iterable of lines without line break
+        '''
+
+        # lines are joined in chunks to avoid handling each line separately
+        lines = iter(lines)
+        while True:
+            chunk = list(islice(lines, LINES_PER_CHUNK))
+            if not chunk:
+                break
+            chunk.append("")
+            self.write("\n".join(chunk))
+
+    def write_header(self, problem_name, nvars, nconss, sense, nbinvars=0, nintvars=0, nimplvars=0, ncontvars=0):
+        '''
+        writes the STATISTICS and OBJECTIVE section and opens the VARIABLES section
+
+        problem_name - name of the problem
+        nvars        - number of variables
+        nconss       - number of constraints
+        sense        - objective sense, i.e., "minimize" or "maximize"
+        nbinvars     - number of binary variables
+        nintvars     - number of integer variables
+        nimplvars    - number of implicit integer variables
+        ncontvars    - number of continuous variables
+        '''
+
+        self.write_lines([
+            "STATISTICS",
+            f"  Problem name     : {problem_name}",
+            f"  Variables        : {nvars} ({nbinvars} binary, {nintvars} integer, {nimplvars} implicit integer, {ncontvars} continuous)",
+            f"  Constraints      : {nconss} initial, {nconss} maximal",
+            "OBJECTIVE",
+            f"  Sense            : {sense}",
+            "VARIABLES"
+            ])
+
+    def begin_constraints(self):
+        '''
+        closes the VARIABLES section and opens the CONSTRAINTS section
+        '''
+
+        self.write("CONSTRAINTS\n")
+
+    def end(self):
+        '''
+        terminates the CIP file
+        '''
+
+        self.write("END\n\n")
+
+    def flush(self):
+        '''
+        writes all buffered text to the file
+        '''
+
+        if self.buffer:
+            self.f.write("".join(self.buffer))
+            self.buffer = []
+            self.buffered = 0
+
+    def open_solver(self, solver):
+        '''
+        starts a solver reading the model from its standard input and returns the pipe to the solver
+
+        solver - list of arguments of the command of the solver, "-f <CIP file>" is appended
+        '''
+
+        # the solver determines the format of the model by the ending of the file name, hence the
+        # pipe is given this name by a symbolic link to /dev/stdin; like any pipe, it can only be
+        # read once from the beginning to the end, i.e., the reader must not reopen or rewind the file
+        self.tmpdir = tempfile.mkdtemp()
+        link = os.path.join(self.tmpdir, os.path.basename(self.name))
+        os.symlink("/dev/stdin", link)
+
+        self.name = os.path.splitext(self.name)[0] + ".out"
+        try:
+            with open(self.name, 'w') as log:
+                self.process = subprocess.Popen(solver + ["-f", link], stdin=subprocess.PIPE, stdout=log,
+                                                stderr=subprocess.STDOUT, text=True)
+        except OSError:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+            raise
+
+        return self.process.stdin
+
+    def close(self):
+        '''
+        flushes the buffer and closes the file
+        '''
+
+        if self.f is None:
+            return
+
+        try:
+            self.flush()
+            self.f.close()
+        finally:
+            self.f = None
+            if self.process is not None:
+                self.close_solver()
+
+    def close_solver(self):
+        '''
+        waits until the solver that reads the model terminates and raises an error if it failed
+        '''
+
+        returncode = self.process.wait()
+        self.process = None
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+        if returncode != 0:
+            raise RuntimeError(f"solver terminated with exit code {returncode}, see {self.name}")
+
+def constraint_expression(cons):
+    '''
+    returns the expression of a constraint of a model.Model in CIP format including its sides
+
+    cons - the constraint
+    '''
+
+    expression = cons.cip()
+    (lhs, rhs) = (cons.lhs, cons.rhs)
+
+    if lhs == -math.inf:
+        return f"{expression} <= {format_number(rhs)}"
+    elif rhs == math.inf:
+        return f"{expression} >= {format_number(lhs)}"
+    elif lhs == rhs:
+        return f"{expression} == {format_number(rhs)}"
+
+    return f"{format_number(cons.lhs)} <= {expression} <= {format_number(cons.rhs)}"
+
+def constraint_text(cons):
+    '''
+    returns the line defining a constraint of a model.Model in CIP format
+
+    cons - the constraint
+    '''
+
+    return constraint_line("nonlinear" if cons.linear_terms() is None else "linear", cons.name, constraint_expression(cons))
+
+def write_section(out, model, key, lines):
+    '''
+    writes lines of a part of a model, which are rendered only once if the part is shared by several models
+
+    out   - CIPWriter to which the lines are written
+    model - the model.Model
+    key   - key identifying the part and the format, see model.Model.rendered
+    lines - function without arguments returning an iterable of the lines without line break
+    '''
+
+    if model.cache is None:
+        out.write_lines(lines())
+    else:
+        out.write(model.rendered(key, lambda: "".join(line + "\n" for line in lines())))
+
+def write_cip(model, cip):
+    '''
+    writes a model.Model in CIP format
+
+    The header contains the exact numbers of variables and constraints of the model.
+
+    model - the model
+    cip   - CIPWriter to which the model is written
+    '''
+
+    cip.write_header(model.name, model.nvars(), model.nconss(), model.sense, nbinvars=model.nvars("binary"),
+                     nintvars=model.nvars("integer"), nimplvars=model.nvars("implicit"),
+                     ncontvars=model.nvars("continuous"))
+
+    # variables
+    write_section(cip, model, ("cip", "variables"),
+                  lambda: (variable_line(var.vartype, var.name, format_number(var.obj), format_number(var.lb),
+                                         format_number(var.ub)) for var in model.variables))
+
+    # constraints
+    cip.begin_constraints()
+
+    for block in model.blocks:
+        write_section(cip, model, ("cip", block), lambda: block.lines(constraint_text))
+
+    cip.end()
@@ -1,25 +1,235 @@
+import argparse
+import multiprocessing
+import os
+import shlex
+import sys
+import time
+import cip_writer as cw
 import generate_instances_elec as g1
 import generate_instances_kissingnumber as g2
 import generate_instances_packing as g3
 import generate_instances_maxcut as g4
+import instance_manifest as imf
+import lp_writer as lw
+import model as md
+import osil_writer as ow
+import symmetry_handling_conss as shc
 
-# generate instances of elec problem
-for D in range(2,4):
-    for N in range(3,15):
-        for S in range(7):
-            g1.generate_cip_file(N, D, S, write_to="instances")
-
-# generate instances of kissingnumber problem
-for D in range(2,4):
-    for N in range(3,15):
-        for S in range(7):
-            g2.generate_cip_file(N, D, True, S, write_to="instances")
-
-# generate instances of packing problem
-for D in range(2,4):
-    for N in range(3,15):
-        for S in range(7):
-            g3.generate_cip_file(N, D, S, write_to="instances")
-
-# generate instances of maxcut problem
-g4.generate_instances_color02(color02path, "instances")
+# modules writing models, the files of all generators depend on them
+WRITER_MODULES = [md, cw, lw, ow]
+
+def variants_label(symmetry_methods):
+    '''
+    returns the part of a job label describing the generated variants of symmetry handling, e.g., "sym{0,1,2}"
+
+    symmetry_methods - list of variants of symmetry handling inequalities
+    '''
+
+    if len(symmetry_methods) == 1:
+        return f"sym{symmetry_methods[0]}"
+
+    return "sym{" + ",".join(str(S) for S in symmetry_methods) + "}"
+
+def structured_jobs(write_to, symmetry_methods=shc.SYMMETRY_METHODS, compression=None, solver=None, manifest=None,
+                    fileformat="cip"):
+    '''
+    returns the list of jobs that generate the instances of the elec, kissingnumber,
+    and packing problem
+
+    Each job generates all variants of symmetry handling of a pair (N, D), such that
+    the model shared by the variants is rendered only once. If a manifest is given,
+    variants that are up to date are not generated again and pairs (N, D) whose
+    variants are all up to date do not get a job.
+
+    write_to         - path to the target directory
+    symmetry_methods - list of variants of symmetry handling inequalities to be generated
+    compression      - compression of the files, see cip_writer.CIPWriter (None if files shall not be compressed)
+    solver           - command of a solver reading the models instead of files, see cip_writer.CIPWriter
+    manifest         - manifest of the instances in the target directory (None if all instances shall be generated)
+    fileformat       - format of the files, i.e., a key of model.FORMATS
+    '''
+
+    jobs = []
+    options = {"write_to": write_to, "compression": compression, "solver": solver, "fileformat": fileformat}
+
+    # instances of elec, kissingnumber, and packing problem, the kissingnumber problem is reformulated
+    for (family, generator, reformulation) in [("elec", g1, {}), ("kissingnumber", g2, {"use_reformulation": True}),
+                                               ("packing", g3, {})]:
+        version = imf.source_version([generator, shc] + WRITER_MODULES)
+
+        for D in range(2,4):
+            for N in range(3,15):
+                variants = []
+                instances = []
+                for S in symmetry_methods:
+                    label = f"{family}_N{N}_D{D}_sym{S}"
+                    key = imf.instance_key(version, family, dict(N=N, D=D, symmetry_method=S, compression=compression,
+                                                                 fileformat=fileformat, **reformulation))
+                    if manifest is None or not manifest.is_current(label, key):
+                        variants.append(S)
+                        instances.append((label, key))
+
+                if variants:
+                    jobs.append((f"{family}_N{N}_D{D}_{variants_label(variants)}", generator.generate_cip_files,
+                                 (N, D, *reformulation.values(), variants), options, instances))
+
+    return jobs
+
+def maxcut_jobs(color02path, write_to, cache_dir=None, compression=None, solver=None, manifest=None, fileformat="cip"):
+    '''
+    returns the list of jobs that generate the maxcut instances of the Color02 test set
+
+    If a manifest is given, instances that are up to date do not get a job. The key of
+    an instance depends on the content of its graph file, not on its path.
+
+    color02path - path to directory containing the graphs
+    write_to    - path to the target directory
+    cache_dir   - directory storing parsed graphs (None if no cache shall be used)
+    compression - compression of the files, see cip_writer.CIPWriter (None if files shall not be compressed)
+    solver      - command of a solver reading the models instead of files, see cip_writer.CIPWriter
+    manifest    - manifest of the instances in the target directory (None if all instances shall be generated)
+    fileformat  - format of the files, i.e., a key of model.FORMATS
+    '''
+
+    jobs = []
+    version = imf.source_version([g4] + WRITER_MODULES)
+
+    for inst in g4.COLOR02_INSTANCES:
+        label = f"maxcut_{inst[:-len('.col')]}"
+        graphfile = f"{color02path}/{inst}"
+
+        # jobs of missing graphs are kept, they fail and are reported
+        try:
+            key = imf.instance_key(version, "maxcut", {"graph": imf.file_digest(graphfile), "weighted": False, "seed": 0,
+                                                       "compression": compression, "fileformat": fileformat})
+        except OSError:
+            key = None
+
+        if manifest is not None and key is not None and manifest.is_current(label, key):
+            continue
+
+        jobs.append((label, g4.generate_cip_file, (graphfile, write_to, False),
+                     {"seed": 0, "filetype": ".col", "cache_dir": cache_dir, "compression": compression, "solver": solver,
+                      "fileformat": fileformat},
+                     [(label, key)]))
+
+    return jobs
+
+def run_job(job):
+    '''
+    executes a single generation job and reports whether it was successful
+
+    Returns a tuple (label, success, duration, message, names), where names is the list
+    of names of the generated files in the order of the instances of the job.
+
+    job - tuple (label, function, positional arguments, keyword arguments, instances), where instances is the
+          list of pairs (label, key) of the generated instances
+    '''
+
+    (label, func, args, kwargs, instances) = job
+
+    start = time.time()
+    try:
+        names = func(*args, **kwargs)
+    except Exception as e:
+        return (label, False, time.time() - start, f"{type(e).__name__}: {e}", [])
+
+    if isinstance(names, str):
+        names = [names]
+
+    return (label, True, time.time() - start, "", names)
+
+def run_jobs(jobs, njobs, manifest=None):
+    '''
+    executes generation jobs, possibly in parallel, and prints progress information
+
+    The generated instances are recorded in the manifest, which is saved when all jobs
+    are finished or the generation is interrupted.
+
+    jobs     - list of jobs as returned by structured_jobs or maxcut_jobs
+    njobs    - number of worker processes (1: run sequentially in this process)
+    manifest - manifest of the instances in the target directory (None if generated instances shall not be recorded)
+
+    returns the list of labels of failed jobs
+    '''
+
+    failed = []
+    instances = {job[0]: job[4] for job in jobs}
+
+    if njobs == 1:
+        results = map(run_job, jobs)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(processes=njobs)
+        results = pool.imap_unordered(run_job, jobs)
+
+    try:
+        for (cnt, (label, success, duration, message, names)) in enumerate(results):
+            if success:
+                print(f"[{cnt+1}/{len(jobs)}] generated {label} ({duration:.2f}s)")
+                if manifest is not None:
+                    for ((instance, key), name) in zip(instances[label], names):
+                        manifest.record(instance, key, name)
+            else:
+                print(f"[{cnt+1}/{len(jobs)}] FAILED {label}: {message}", file=sys.stderr)
+                failed.append(label)
+    finally:
+        if manifest is not None:
+            manifest.save()
+
+    if pool is not None:
+        pool.close()
+        pool.join()
+
+    return failed
+
+if __name__ == "__main__":
+
+    # create a parser for arguments
+    parser = argparse.ArgumentParser(description='generates the instances of the structured test sets')
+    parser.add_argument('--write_to', metavar='write_to', type=str, default="instances", help='target directory of instances')
+    parser.add_argument('--color02path', metavar='color02path', type=str, default=None,
+                        help='directory containing the Color02 graphs (maxcut instances are skipped if not provided)')
+    parser.add_argument('--graph_cache', metavar='graph_cache', type=str, default=g4.DEFAULT_GRAPH_CACHE,
+                        help='directory storing parsed graphs of maxcut instances')
+    parser.add_argument('--nocache', default=False, action='store_true', help='whether graphs shall be parsed without cache')
+    parser.add_argument('--jobs', metavar='jobs', type=int, default=1, help='number of parallel worker processes')
+    parser.add_argument('--format', metavar='format', type=str, choices=list(md.FORMATS), default="cip",
+                        help='format of the generated files')
+    parser.add_argument('--compression', metavar='compression', type=str, choices=list(cw.COMPRESSION_ENDINGS), default=None,
+                        help='compression of the generated files')
+    parser.add_argument('--solve', metavar='solve', type=str, default=None,
+                        help='command of a solver, e.g., "scip -s <settings>", into which each instance is streamed instead of writing it')
+    parser.add_argument('--force', default=False, action='store_true',
+                        help='whether all instances shall be generated, including instances that are up to date')
+    parser.add_argument('--sym', metavar='sym', type=int, action='append', choices=shc.SYMMETRY_METHODS, default=None,
+                        help='variant of symmetry handling inequalities to be generated, can be given several times (default: all)')
+
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error("--jobs needs to be positive")
+
+    os.makedirs(args.write_to, exist_ok=True)
+
+    if args.compression is not None and args.solve is not None:
+        parser.error("--compression and --solve cannot be combined")
+
+    symmetry_methods = shc.SYMMETRY_METHODS if args.sym is None else sorted(set(args.sym))
+    solver = None if args.solve is None else shlex.split(args.solve)
+
+    # instances streamed into a solver are not stored, hence, they are neither skipped nor recorded
+    manifest = None if solver is not None else imf.Manifest(args.write_to)
+    current = None if args.force else manifest
+
+    jobs = structured_jobs(args.write_to, symmetry_methods, args.compression, solver, current, args.format)
+    if args.color02path is not None:
+        jobs += maxcut_jobs(args.color02path, args.write_to, None if args.nocache else args.graph_cache, args.compression,
+                            solver, current, args.format)
+
+    failed = run_jobs(jobs, args.jobs, manifest)
+
+    print(f"completed {len(jobs) - len(failed)} of {len(jobs)} jobs")
+    if failed:
+        print("failed jobs: " + " ".join(failed), file=sys.stderr)
+        sys.exit(1)
@@ -1,77 +1,85 @@
 import math
+import model as md
 import symmetry_handling_conss as shc
 
-def generate_cip_file(N, D, symmetry_method, write_to="."):
+def build_model(N, D):
     '''
-    generates files in CIP format that model the detection of Fekete points
+    returns the model without symmetry handling inequalities and the dictionary mapping
+    pairs (point, dimension) to the names of the variables
 
-    E.B. Saff and A.B.J. Kuijlaars. Distributing Many Points on a Sphere.
-    The Mathematical Intelligencer 19(1), pp. 5-11. 1997
-
-    description of parameters:
-    N                 - number of points
-    D                 - dimension of points
-    symmetry_method   - variant of symmetry handling inequalities encoded by an integer
-    write_to          - path to the target directory
-   '''
-    name = f"{write_to}/elec_N{N}_D{D}_sym{symmetry_method}.cip"
-    f = open(name, 'w')
+    N - number of points
+    D - dimension of points
+    '''
 
-    nvars = 1 + N*D
-    nconss = N + 1 + shc.ub_number_conss(N,D)
+    model = md.Model(f"elec_N{N}_D{D}", "minimize")
     x = {(i,j): f"x{i}_{j}" for i in range(N) for j in range(D)}
 
-    # header
-    f.write("STATISTICS\n")
-    f.write(f"  Problem name     : elec_N{N}_D{D}\n")
-    f.write(f"  Variables        : {nvars} (0 binary, 0 integer, 0 implicit integer, {nvars} continuous)\n")
-    f.write(f"  Constraints      : 0 initial, {nconss} maximal\n")
-    f.write("OBJECTIVE\n")
-    f.write("  Sense            : minimize\n")
-    f.write("VARIABLES\n")
-
     # variables
     for d in range(D):
         for i in range(N):
-            f.write(f"  [continuous] <x{i}_{d}>: obj=0, original bounds=[-1.0,1.0]\n")
-    f.write(f"  [continuous] <obj>: obj=1, original bounds=[0,Inf]\n")
-
-    # constraints
-    f.write("CONSTRAINTS\n")
+            model.add_variable(x[i,d], lb=-1, ub=1)
+    model.add_variable("obj", lb=0, ub=math.inf, obj=1)
 
     # every point has squared norm 1
-    for i in range(N):
-        f.write(f"  [nonlinear] <normcons{i}>: ")
-
-        for d in range(D):
-            f.write(f"<x{i}_{d}>^2")
-            if d == D-1:
-                f.write(" == 1;\n")
-            else:
-                f.write(" + ")
+    model.add_constraints([md.Constraint(f"normcons{i}", md.Sum([(1, md.Power(md.Var(x[i,d]), 2)) for d in range(D)]), 1, 1)
+                           for i in range(N)])
 
     # the objective
-    f.write("  [nonlinear] <objcons>: ")
+    terms = []
     for i in range(N):
         for j in range(i+1, N):
-            f.write("1/(")
-            for d in range(D):
-                f.write(f"(<x{i}_{d}> - <x{j}_{d}>)^2")
-                if d == D-1:
-                    f.write(")^(0.5)")
-                else:
-                    f.write(" + ")
+            distance = md.Sum([(1, md.Power(md.Sum([(1, md.Var(x[i,d])), (-1, md.Var(x[j,d]))]), 2)) for d in range(D)])
+            terms.append((1, md.Quotient(1, md.Power(distance, 0.5))))
+    model.add_constraints([md.Constraint("objcons", md.Sum(terms + [(-1, md.Var("obj"))]), rhs=0)])
+
+    return (model, x)
+
+def generate_cip_files(N, D, symmetry_methods, write_to=".", compression=None, solver=None, fileformat="cip"):
+    '''
+    generates files in CIP format (or another format of model.FORMATS) that model the detection of Fekete points
+
+    E.B. Saff and A.B.J. Kuijlaars. Distributing Many Points on a Sphere.
+    The Mathematical Intelligencer 19(1), pp. 5-11. 1997
+
+    The model is built once and written to one file per variant of symmetry
+    handling inequalities, which are appended to the model; its shared part is
+    rendered only once. Returns the list of names of the generated files (or of
+    the logs of the solver).
+
+    description of parameters:
+    N                 - number of points
+    D                 - dimension of points
+    symmetry_methods  - list of variants of symmetry handling inequalities encoded by integers
+    write_to          - path to the target directory
+    compression       - compression of the files, see cip_writer.CIPWriter (None if files shall not be compressed)
+    solver            - command of a solver reading the models instead of files, see cip_writer.CIPWriter
+    fileformat        - format of the files, i.e., a key of model.FORMATS
+    '''
 
-            if i == N-2 and j == N-1:
-                f.write(" - <obj> <= 0;\n")
-            else:
-                f.write(" + ")
+    (model, x) = build_model(N, D)
 
-    # potentially handle symmetries
-    shc.add_symmetry_handling_conss(f, x, N, D, symmetry_method)
+    names = []
+    for symmetry_method in symmetry_methods:
+        # potentially handle symmetries
+        variant = model.variant(model.name, shc.symmetry_handling_conss(x, N, D, symmetry_method))
+        names.append(md.write_model(variant, f"{write_to}/elec_N{N}_D{D}_sym{symmetry_method}", fileformat,
+                                    compression, solver))
 
-    f.write("END\n\n")
+    return names
 
-    f.close()
+def generate_cip_file(N, D, symmetry_method, write_to=".", compression=None, solver=None, fileformat="cip"):
+    '''
+    generates a file in CIP format (or another format of model.FORMATS) that models the detection of
+    Fekete points, see generate_cip_files
+
+    description of parameters:
+    N                 - number of points
+    D                 - dimension of points
+    symmetry_method   - variant of symmetry handling inequalities encoded by an integer
+    write_to          - path to the target directory
+    compression       - compression of the file, see cip_writer.CIPWriter (None if the file shall not be compressed)
+    solver            - command of a solver reading the model instead of a file, see cip_writer.CIPWriter
+    fileformat        - format of the file, i.e., a key of model.FORMATS
+    '''
 
-    return name
+    return generate_cip_files(N, D, [symmetry_method], write_to, compression, solver, fileformat)[0]
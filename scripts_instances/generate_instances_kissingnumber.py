@@ -1,84 +1,97 @@
-import math
+import model as md
 import symmetry_handling_conss as shc
 
-def generate_cip_file(N, D, use_reformulation, symmetry_method, write_to="."):
+def build_model(N, D, use_reformulation):
     '''
-    generates files in CIP format that model the kissing number problem as described in
+    returns the model without symmetry handling inequalities and the dictionary mapping
+    pairs (sphere, dimension) to the names of the variables
 
-    L. Liberti. Symmetry in Mathematical Programming. Combinatorial optimization and applications.
-    LNCS 5165, pp. 328-338, Springer. 2008
-
-    description of parameters:
     N                 - number of spheres
     D                 - dimension in which spheres live
     use_reformulation - whether sum_d (x^i_d - x^j_d)^2 shall be replaced by 8 - 2 * sum_d x^i_d * x^j_d
-    symmetry_method   - variant of symmetry handling inequalities encoded by an integer
-    write_to          - path to the target directory
     '''
-    name = f"{write_to}/kissingnumber_N{N}_D{D}_reform{use_reformulation}_sym{symmetry_method}.cip"
-    f = open(name, 'w')
 
-    nvars = 1 + N*D
-    nconss = N + N*(N-1)/2 + shc.ub_number_conss(N,D)
+    model = md.Model(f"kissingnumber_N{N}_D{D}", "maximize")
     x = {(i,j): f"x{i}_{j}" for i in range(N) for j in range(D)}
 
-    # header
-    f.write("STATISTICS\n")
-    f.write(f"  Problem name     : kissingnumber_N{N}_D{D}\n")
-    f.write(f"  Variables        : {nvars} (0 binary, 0 integer, 0 implicit integer, {nvars} continuous)\n")
-    f.write(f"  Constraints      : 0 initial, {nconss} maximal\n")
-    f.write("OBJECTIVE\n")
-    f.write("  Sense            : maximize\n")
-    f.write("VARIABLES\n")
-
     # variables
     for d in range(D):
         for i in range(N):
-            f.write(f"  [continuous] <x{i}_{d}>: obj=0, original bounds=[-2.0,2.0]\n")
-    f.write(f"  [continuous] <obj>: obj=1, original bounds=[0,1]\n")
-
-    # constraints
-    f.write("CONSTRAINTS\n")
+            model.add_variable(x[i,d], lb=-2, ub=2)
+    model.add_variable("obj", lb=0, ub=1, obj=1)
 
     # every point has squared norm 4
-    for i in range(N):
-        f.write(f"  [nonlinear] <normcons{i}>: ")
-
-        for d in range(D):
-            f.write(f"<x{i}_{d}>^2")
-            if d == D-1:
-                f.write(" == 4;\n")
-            else:
-                f.write(" + ")
+    model.add_constraints([md.Constraint(f"normcons{i}", md.Sum([(1, md.Power(md.Var(x[i,d]), 2)) for d in range(D)]), 4, 4)
+                           for i in range(N)])
 
     # all points have distance at least 4*objective
+    conss = []
     for i in range(N):
         for j in range(i+1, N):
-            f.write(f"  [nonlinear] <dist{i}_{j}>: ")
-                
             if use_reformulation:
                 # 8 - 2 * sum_d x^i_d * x^j_d >= 4*obj
-                f.write("8 - ")
-                for d in range(D):
-                    f.write(f"2 * <x{i}_{d}> * <x{j}_{d}>")
-                    if d == D-1:
-                        f.write(" - 4*<obj> >= 0;\n")
-                    else:
-                        f.write(" - ")
+                terms = [(-2, md.Product([md.Var(x[i,d]), md.Var(x[j,d])])) for d in range(D)]
+                distance = md.Sum(terms + [(-4, md.Var("obj"))], 8)
             else:
                 # sum_d (x^i_d - x^j_d)^2 >= 4*obj
-                for d in range(D):
-                    f.write(f"(<x{i}_{d}> - <x{j}_{d}>)^2")
-                    if d == D-1:
-                        f.write(" - 4*<obj> >= 0;\n")
-                    else:
-                        f.write(" + ")
+                terms = [(1, md.Power(md.Sum([(1, md.Var(x[i,d])), (-1, md.Var(x[j,d]))]), 2)) for d in range(D)]
+                distance = md.Sum(terms + [(-4, md.Var("obj"))])
+            conss.append(md.Constraint(f"dist{i}_{j}", distance, lhs=0))
+    model.add_constraints(conss)
 
-    # potentially handle symmetries
-    shc.add_symmetry_handling_conss(f, x, N, D, symmetry_method)
+    return (model, x)
 
-    f.write("END\n\n")
+def generate_cip_files(N, D, use_reformulation, symmetry_methods, write_to=".", compression=None, solver=None,
+                       fileformat="cip"):
+    '''
+    generates files in CIP format (or another format of model.FORMATS) that model the kissing number problem as described in
 
-    f.close()
+    L. Liberti. Symmetry in Mathematical Programming. Combinatorial optimization and applications.
+    LNCS 5165, pp. 328-338, Springer. 2008
+
+    The model is built once and written to one file per variant of symmetry
+    handling inequalities, which are appended to the model; its shared part is
+    rendered only once. Returns the list of names of the generated files (or of
+    the logs of the solver).
+
+    description of parameters:
+    N                 - number of spheres
+    D                 - dimension in which spheres live
+    use_reformulation - whether sum_d (x^i_d - x^j_d)^2 shall be replaced by 8 - 2 * sum_d x^i_d * x^j_d
+    symmetry_methods  - list of variants of symmetry handling inequalities encoded by integers
+    write_to          - path to the target directory
+    compression       - compression of the files, see cip_writer.CIPWriter (None if files shall not be compressed)
+    solver            - command of a solver reading the models instead of files, see cip_writer.CIPWriter
+    fileformat        - format of the files, i.e., a key of model.FORMATS
+    '''
+
+    (model, x) = build_model(N, D, use_reformulation)
+
+    names = []
+    for symmetry_method in symmetry_methods:
+        # potentially handle symmetries
+        variant = model.variant(model.name, shc.symmetry_handling_conss(x, N, D, symmetry_method))
+        names.append(md.write_model(variant,
+                                    f"{write_to}/kissingnumber_N{N}_D{D}_reform{use_reformulation}_sym{symmetry_method}",
+                                    fileformat, compression, solver))
+
+    return names
+
+def generate_cip_file(N, D, use_reformulation, symmetry_method, write_to=".", compression=None, solver=None,
+                      fileformat="cip"):
+    '''
+    generates a file in CIP format (or another format of model.FORMATS) that models the kissing number
+    problem, see generate_cip_files
+
+    description of parameters:
+    N                 - number of spheres
+    D                 - dimension in which spheres live
+    use_reformulation - whether sum_d (x^i_d - x^j_d)^2 shall be replaced by 8 - 2 * sum_d x^i_d * x^j_d
+    symmetry_method   - variant of symmetry handling inequalities encoded by an integer
+    write_to          - path to the target directory
+    compression       - compression of the file, see cip_writer.CIPWriter (None if the file shall not be compressed)
+    solver            - command of a solver reading the model instead of a file, see cip_writer.CIPWriter
+    fileformat        - format of the file, i.e., a key of model.FORMATS
+    '''
 
-    return name
+    return generate_cip_files(N, D, use_reformulation, [symmetry_method], write_to, compression, solver, fileformat)[0]
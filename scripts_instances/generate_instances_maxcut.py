@@ -1,49 +1,158 @@
-import networkx as nx
+import io
+import math
+import os
 import random
-
-def read_graph(graphfile):
+import re
+import numpy as np
+import model as md
+
+# default directory storing parsed graphs
+DEFAULT_GRAPH_CACHE = "graph_cache"
+
+# lines of a file in DIMACS format that do not define an edge, i.e., comments and the problem line
+NONEDGE_PATTERN = re.compile(rb"^(?!e[ \t]).*$", re.MULTILINE)
+
+# graphs from the Color02 test set
+COLOR02_INSTANCES = ["1-FullIns_3.col", "1-FullIns_4.col", "1-FullIns_5.col", "1-Insertions_4.col", "1-Insertions_5.col",
+                     "1-Insertions_6.col", "2-FullIns_3.col", "2-FullIns_4.col", "2-FullIns_5.col", "2-Insertions_3.col",
+                     "2-Insertions_4.col", "2-Insertions_5.col", "3-FullIns_3.col", "3-FullIns_4.col", "3-FullIns_5.col",
+                     "3-Insertions_3.col", "3-Insertions_4.col", "3-Insertions_5.col", "4-FullIns_3.col", "4-FullIns_4.col",
+                     "4-FullIns_5.col", "4-Insertions_3.col", "4-Insertions_4.col", "5-FullIns_3.col", "5-FullIns_4.col",
+                     "abb313GPIA.col", "anna.col", "ash331GPIA.col", "ash608GPIA.col", "ash958GPIA.col", "david.col",
+                     "DSJC1000.1.col", "DSJC1000.5.col", "DSJC1000.9.col", "DSJC125.1.col", "DSJC125.5.col", "DSJC125.9.col",
+                     "DSJC250.1.col", "DSJC250.5.col", "DSJC250.9.col", "DSJC500.1.col", "DSJC500.5.col", "DSJC500.9.col",
+                     "DSJR500.1c.col", "DSJR500.1.col", "DSJR500.5.col", "fpsol2.i.1.col", "fpsol2.i.2.col", "fpsol2.i.3.col",
+                     "games120.col", "homer.col", "huck.col", "inithx.i.1.col", "inithx.i.2.col", "inithx.i.3.col", "jean.col",
+                     "latin_square_10.col", "le450_15a.col", "le450_15b.col", "le450_15c.col", "le450_15d.col", "le450_25a.col",
+                     "le450_25b.col", "le450_25c.col", "le450_25d.col", "le450_5a.col", "le450_5b.col", "le450_5c.col",
+                     "le450_5d.col", "miles1000.col", "miles1500.col", "miles250.col", "miles500.col", "miles750.col",
+                     "mug100_1.col", "mug100_25.col", "mug88_1.col", "mug88_25.col", "mulsol.i.1.col", "mulsol.i.2.col",
+                     "mulsol.i.3.col", "mulsol.i.4.col", "mulsol.i.5.col", "myciel3.col", "myciel4.col", "myciel5.col",
+                     "myciel6.col", "myciel7.col", "qg.order100.col", "qg.order30.col", "qg.order40.col", "qg.order60.col",
+                     "queen10_10.col", "queen11_11.col", "queen12_12.col", "queen13_13.col", "queen14_14.col", "queen15_15.col",
+                     "queen16_16.col", "queen5_5.col", "queen6_6.col", "queen7_7.col", "queen8_12.col", "queen8_8.col",
+                     "queen9_9.col", "school1.col", "school1_nsh.col", "wap01a.col", "wap02a.col", "wap03a.col", "wap04a.col",
+                     "wap05a.col", "wap06a.col", "wap07a.col", "wap08a.col", "will199GPIA.col", "zeroin.i.1.col", "zeroin.i.2.col",
+                     "zeroin.i.3.col"]
+
+def parse_edges(graphfile):
     '''
-    reads a graph from a file in DIMACS format
+    returns the array of shape (number of edge lines, 2) containing the end nodes of all edge lines of a file in DIMACS format
+
+    All other lines are removed by a single regular expression, and the end nodes, i.e.,
+    the first two numbers of the remaining edge lines, are converted in bulk. Further
+    numbers of an edge line, e.g., weights, are ignored. Raises ValueError if an edge
+    line has less than two numbers.
 
     graphfile - the graph in DIMACS format
     '''
 
-    nodes = set()
-    edges = set()
+    with open(graphfile, 'rb') as f:
+        text = NONEDGE_PATTERN.sub(b"", f.read())
+
+    if not text.strip():
+        return np.zeros((0, 2), dtype=np.int64)
+
+    try:
+        return np.loadtxt(io.BytesIO(text), dtype=np.int64, usecols=(1, 2), ndmin=2)
+    except ValueError as e:
+        raise ValueError(f"malformed edge line in {graphfile}: {e}")
+
+def sorted_unique(values):
+    '''
+    returns the sorted array of distinct entries of a one-dimensional array
+
+    values - one-dimensional array
+    '''
+
+    values = np.sort(values)
+    if len(values) == 0:
+        return values
+
+    return values[np.concatenate(([True], values[1:] != values[:-1]))]
+
+def canonical_edges(edges):
+    '''
+    returns the sorted array of distinct edges (u, v) with u <= v of an array of edges
+
+    edges - array of shape (number of edges, 2)
+    '''
+
+    if len(edges) == 0:
+        return edges
 
-    f = open(graphfile, 'r')
+    # encode each edge by a single integer, such that sorting the codes sorts the edges lexicographically
+    first = np.minimum(edges[:, 0], edges[:, 1])
+    second = np.maximum(edges[:, 0], edges[:, 1])
+    base = int(second.max()) + 1
+    codes = sorted_unique(first * base + second)
 
-    for line in f:
-        if line.startswith('e'):
-            info = line.split()
-            u = int(info[1])
-            v = int(info[2])
-            edge = (u,v)
-            if v < u:
-                edge = (v,u)
+    return np.stack((codes // base, codes % base), axis=1)
 
-            nodes.add(u)
-            nodes.add(v)
-            edges.add(edge)
+def read_graph(graphfile, cache_dir=None):
+    '''
+    reads a graph from a file in DIMACS format
 
-    f.close()
+    Returns a pair (nodes, edges) of the sorted array of nodes incident to an edge and
+    the sorted array of shape (number of edges, 2) of distinct edges (u, v) with u <= v.
 
-    return list(nodes), list(edges)
+    If a cache directory is given, the parsed graph is stored there in binary format
+    and read from there as long as the size and modification time of the graph file
+    do not change.
 
-def generate_cip_file(graphfile, write_to, weighted, filetype, seed=0):
+    graphfile - the graph in DIMACS format
+    cache_dir - directory storing parsed graphs (None if no cache shall be used)
     '''
-    generates a max-cut problem for an undirected graph
 
-    graphfile - file encoding the graph in DIMACS format
-    write_to  - path to the target directory
-    weighted  - whether a weighted graph shall be created
-    filetype  - type of file, e.g., ".col" or ".dimacs"
-    seed      - random seed used to generate weights
+    stat = os.stat(graphfile)
+    source = os.path.abspath(graphfile)
+
+    if cache_dir is not None:
+        cachefile = os.path.join(cache_dir, os.path.basename(graphfile) + ".npz")
+        try:
+            with np.load(cachefile) as cached:
+                if (str(cached["source"]) == source and int(cached["size"]) == stat.st_size
+                    and int(cached["mtime"]) == stat.st_mtime_ns):
+                    edges = cached["edges"].astype(np.int64)
+                    return sorted_unique(edges.ravel()), edges
+        except (OSError, KeyError, ValueError):
+            pass
+
+    edges = canonical_edges(parse_edges(graphfile))
+
+    if cache_dir is not None:
+        # replace the cached graph atomically, several processes may parse the same graph
+        os.makedirs(cache_dir, exist_ok=True)
+        tmpname = f"{cachefile}.{os.getpid()}.tmp"
+        with open(tmpname, 'wb') as f:
+            np.savez(f, edges=edges.astype(np.int32), source=source, size=stat.st_size, mtime=stat.st_mtime_ns)
+        os.replace(tmpname, cachefile)
+
+    return sorted_unique(edges.ravel()), edges
+
+def generate_cip_file(graphfile, write_to, weighted, filetype, seed=0, cache_dir=None, compression=None, solver=None,
+                      fileformat="cip"):
+    '''
+    generates a max-cut problem for an undirected graph and returns the name of the generated file
+
+    The constraints of all edges follow two patterns, which are rendered only once, see model.LinearBlock.
+
+    graphfile   - file encoding the graph in DIMACS format
+    write_to    - path to the target directory
+    weighted    - whether a weighted graph shall be created
+    filetype    - type of file, e.g., ".col" or ".dimacs"
+    seed        - random seed used to generate weights
+    cache_dir   - directory storing parsed graphs (None if no cache shall be used)
+    compression - compression of the file, see cip_writer.CIPWriter (None if the file shall not be compressed)
+    solver      - command of a solver reading the model instead of a file, see cip_writer.CIPWriter
+    fileformat  - format of the file, i.e., a key of model.FORMATS
     '''
 
     assert graphfile.endswith(filetype)
 
-    nodes, edges = read_graph(graphfile)
+    nodes, edges = read_graph(graphfile, cache_dir)
+    nodes = nodes.tolist()
+    edges = [tuple(edge) for edge in edges.tolist()]
     graphname = graphfile.split('/')[-1][:-len(filetype)]
 
     # possibly generate signs for each edge (needed to create weights)
@@ -52,78 +161,38 @@ def generate_cip_file(graphfile, write_to, weighted, filetype, seed=0):
         random.seed(a=seed)
         signs = [random.randint(0,1) for e in edges]
 
-    name = f"{write_to}/maxcut_{graphname}.cip"
+    name = f"{write_to}/maxcut_{graphname}"
     if not weighted:
-        name = f"{write_to}/unweighted_maxcut_{graphname}.cip"
-    f = open(name, 'w')
+        name = f"{write_to}/unweighted_maxcut_{graphname}"
 
-    nvars = len(nodes) + len(edges)
-    nconss = 2 * len(edges)
+    model = md.Model(f"maxcut_{graphname}", "maximize")
     nodevars = {v: f"s{v}" for v in nodes}
     edgevars = {(u,v): f"c{u}_{v}" for (u,v) in edges}
 
-    # header
-    f.write("STATISTICS\n")
-    f.write(f"  Problem name     : maxcut_{graphname}\n")
-    f.write(f"  Variables        : {nvars} ({nvars} binary, 0 integer, 0 implicit integer, 0 continuous)\n")
-    f.write(f"  Constraints      : 0 initial, {nconss} maximal\n")
-    f.write("OBJECTIVE\n")
-    f.write("  Sense            : maximize\n")
-    f.write("VARIABLES\n")
-
     # variables
     for e in range(len(edges)):
         obj = 1
         # possibly compute an edge weight
         if weighted:
             -1 + 2*signs[e]
-        f.write(f"  [binary] <{edgevars[edges[e]]}>: obj={obj}, original bounds=[0,1]\n")
+        model.add_variable(edgevars[edges[e]], "binary", 0, 1, obj)
     for v in nodes:
-        f.write(f"  [binary] <{nodevars[v]}>: obj=0, original bounds=[0,1]\n")
-
-    # constraints
-    f.write("CONSTRAINTS\n")
+        model.add_variable(nodevars[v], "binary", 0, 1)
 
     # constraints for edges
-    for e in range(len(edges)):
-        (u,v) = edges[e]
-        f.write(f"  [linear] <edgecons{e}_A>: +<{nodevars[u]}> +<{nodevars[v]}> +<{edgevars[(u,v)]}> <= 2;\n")
-        f.write(f"  [linear] <edgecons{e}_B>: -<{nodevars[u]}> -<{nodevars[v]}> +<{edgevars[(u,v)]}> <= 0;\n")
-
-    f.write("END\n\n")
+    model.add_linear_block([("edgecons{0}_A", [1, 1, 1], -math.inf, 2), ("edgecons{0}_B", [-1, -1, 1], -math.inf, 0)],
+                           [(nodevars[u], nodevars[v], edgevars[(u,v)]) for (u,v) in edges])
 
-    f.close()
+    return md.write_model(model, name, fileformat, compression, solver)
 
-def generate_instances_color02(color02path, write_to):
+def generate_instances_color02(color02path, write_to, cache_dir=None):
     '''
     generates max-cut problems for graphs from the DIMACS Color02 test set
 
     color02path - path to directory containing the graphs
     write_to    - path to the target directory where max-cut problems are stored
+    cache_dir   - directory storing parsed graphs (None if no cache shall be used)
     '''
 
-    # graphs from the test set
-    instances = ["1-FullIns_3.col", "1-FullIns_4.col", "1-FullIns_5.col", "1-Insertions_4.col", "1-Insertions_5.col",
-                 "1-Insertions_6.col", "2-FullIns_3.col", "2-FullIns_4.col", "2-FullIns_5.col", "2-Insertions_3.col",
-                 "2-Insertions_4.col", "2-Insertions_5.col", "3-FullIns_3.col", "3-FullIns_4.col", "3-FullIns_5.col",
-                 "3-Insertions_3.col", "3-Insertions_4.col", "3-Insertions_5.col", "4-FullIns_3.col", "4-FullIns_4.col",
-                 "4-FullIns_5.col", "4-Insertions_3.col", "4-Insertions_4.col", "5-FullIns_3.col", "5-FullIns_4.col",
-                 "abb313GPIA.col", "anna.col", "ash331GPIA.col", "ash608GPIA.col", "ash958GPIA.col", "david.col",
-                 "DSJC1000.1.col", "DSJC1000.5.col", "DSJC1000.9.col", "DSJC125.1.col", "DSJC125.5.col", "DSJC125.9.col",
-                 "DSJC250.1.col", "DSJC250.5.col", "DSJC250.9.col", "DSJC500.1.col", "DSJC500.5.col", "DSJC500.9.col",
-                 "DSJR500.1c.col", "DSJR500.1.col", "DSJR500.5.col", "fpsol2.i.1.col", "fpsol2.i.2.col", "fpsol2.i.3.col",
-                 "games120.col", "homer.col", "huck.col", "inithx.i.1.col", "inithx.i.2.col", "inithx.i.3.col", "jean.col",
-                 "latin_square_10.col", "le450_15a.col", "le450_15b.col", "le450_15c.col", "le450_15d.col", "le450_25a.col",
-                 "le450_25b.col", "le450_25c.col", "le450_25d.col", "le450_5a.col", "le450_5b.col", "le450_5c.col",
-                 "le450_5d.col", "miles1000.col", "miles1500.col", "miles250.col", "miles500.col", "miles750.col",
-                 "mug100_1.col", "mug100_25.col", "mug88_1.col", "mug88_25.col", "mulsol.i.1.col", "mulsol.i.2.col",
-                 "mulsol.i.3.col", "mulsol.i.4.col", "mulsol.i.5.col", "myciel3.col", "myciel4.col", "myciel5.col",
-                 "myciel6.col", "myciel7.col", "qg.order100.col", "qg.order30.col", "qg.order40.col", "qg.order60.col",
-                 "queen10_10.col", "queen11_11.col", "queen12_12.col", "queen13_13.col", "queen14_14.col", "queen15_15.col",
-                 "queen16_16.col", "queen5_5.col", "queen6_6.col", "queen7_7.col", "queen8_12.col", "queen8_8.col",
-                 "queen9_9.col", "school1.col", "school1_nsh.col", "wap01a.col", "wap02a.col", "wap03a.col", "wap04a.col",
-                 "wap05a.col", "wap06a.col", "wap07a.col", "wap08a.col", "will199GPIA.col", "zeroin.i.1.col", "zeroin.i.2.col",
-                 "zeroin.i.3.col"]
-
-    for inst in instances:
-        generate_cip_file(f"{color02path}/{inst}", write_to, False, seed=0, filetype=".col")
+    for inst in COLOR02_INSTANCES:
+        generate_cip_file(f"{color02path}/{inst}", write_to, False, seed=0, filetype=".col", cache_dir=cache_dir)
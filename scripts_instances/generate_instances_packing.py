@@ -1,59 +1,78 @@
-import math
+import model as md
 import symmetry_handling_conss as shc
 
-def generate_cip_file(N, D, symmetry_method, write_to="."):
+def build_model(N, D, name):
     '''
-    generates files in CIP format that model the problem to allocate N points
-    in a hypercube such that the pairwise l1-distance is as large as possible.
+    returns the model without symmetry handling inequalities and the dictionary mapping
+    pairs (ball, dimension) to the names of the variables
 
-    description of parameters:
-    N               - number of l1-balls
-    D               - dimesion of points
-    symmetry_method - variant of symmetry handling inequalities encoded by an integer
-    write_to        - path to the target directory
+    N    - number of l1-balls
+    D    - dimesion of points
+    name - name of the problem
     '''
-    name = f"{write_to}/packing_N{N}_D{D}_sym{symmetry_method}.cip"
-    f = open(name, 'w')
 
-    nvars = N*D + 1
-    nconss = N*(N-1)/2 + shc.ub_number_conss(N,D)
+    model = md.Model(name, "maximize")
     x = {(i,j): f"x{i}_{j}" for i in range(N) for j in range(D)}
 
-    # header
-    f.write("STATISTICS\n")
-    f.write(f"  Problem name     : packing_N{N}_D{D}_sym{symmetry_method}\n")
-    f.write(f"  Variables        : {nvars} (0 binary, 0 integer, 0 implicit integer, {nvars} continuous)\n")
-    f.write(f"  Constraints      : 0 initial, {nconss} maximal\n")
-    f.write("OBJECTIVE\n")
-    f.write("  Sense            : maximize\n")
-    f.write("VARIABLES\n")
-
     # variables
     for d in range(D):
         for i in range(N):
-            f.write(f"  [continuous] <x{i}_{d}>: obj=0, original bounds=[-1,1]\n")
-    f.write(f"  [continuous] <obj>: obj=1, original bounds=[0,{2*D}]\n")
-
-    # constraints
-    f.write("CONSTRAINTS\n")
+            model.add_variable(x[i,d], lb=-1, ub=1)
+    model.add_variable("obj", lb=0, ub=2*D, obj=1)
 
     # all balls have sufficient l1-distance
-    for i in range(N):
-        for j in range(i+1, N):
-            f.write(f"  [nonlinear] <dist{i}_{j}>: ")
-            for d in range(D):
-                f.write(f"abs(<{x[i,d]}> - <{x[j,d]}>)")
-                if d == D - 1:
-                    f.write(" - 2*<obj> >= 0;\n")
-                else:
-                    f.write(" + ")
-                
+    model.add_constraints([md.Constraint(f"dist{i}_{j}",
+                                         md.Sum([(1, md.Abs(md.Sum([(1, md.Var(x[i,d])), (-1, md.Var(x[j,d]))])))
+                                                 for d in range(D)] + [(-2, md.Var("obj"))]), lhs=0)
+                           for i in range(N) for j in range(i+1, N)])
+
+    return (model, x)
 
-    # potentially handle symmetries
-    shc.add_symmetry_handling_conss(f, x, N, D, symmetry_method)
+def generate_cip_files(N, D, symmetry_methods, write_to=".", compression=None, solver=None, fileformat="cip"):
+    '''
+    generates files in CIP format (or another format of model.FORMATS) that model the problem to allocate N points
+    in a hypercube such that the pairwise l1-distance is as large as possible.
 
-    f.write("END\n\n")
+    The model is built once and written to one file per variant of symmetry
+    handling inequalities, which are appended to the model; its shared part is
+    rendered only once. Returns the list of names of the generated files (or of
+    the logs of the solver).
 
-    f.close()
+    description of parameters:
+    N                - number of l1-balls
+    D                - dimesion of points
+    symmetry_methods - list of variants of symmetry handling inequalities encoded by integers
+    write_to         - path to the target directory
+    compression      - compression of the files, see cip_writer.CIPWriter (None if files shall not be compressed)
+    solver           - command of a solver reading the models instead of files, see cip_writer.CIPWriter
+    fileformat       - format of the files, i.e., a key of model.FORMATS
+    '''
+
+    (model, x) = build_model(N, D, f"packing_N{N}_D{D}")
+
+    names = []
+    for symmetry_method in symmetry_methods:
+        # potentially handle symmetries
+        variant = model.variant(f"packing_N{N}_D{D}_sym{symmetry_method}",
+                                shc.symmetry_handling_conss(x, N, D, symmetry_method))
+        names.append(md.write_model(variant, f"{write_to}/packing_N{N}_D{D}_sym{symmetry_method}", fileformat,
+                                    compression, solver))
+
+    return names
+
+def generate_cip_file(N, D, symmetry_method, write_to=".", compression=None, solver=None, fileformat="cip"):
+    '''
+    generates a file in CIP format (or another format of model.FORMATS) that models the packing problem,
+    see generate_cip_files
+
+    description of parameters:
+    N               - number of l1-balls
+    D               - dimesion of points
+    symmetry_method - variant of symmetry handling inequalities encoded by an integer
+    write_to        - path to the target directory
+    compression     - compression of the file, see cip_writer.CIPWriter (None if the file shall not be compressed)
+    solver          - command of a solver reading the model instead of a file, see cip_writer.CIPWriter
+    fileformat      - format of the file, i.e., a key of model.FORMATS
+    '''
 
-    return name
+    return generate_cip_files(N, D, [symmetry_method], write_to, compression, solver, fileformat)[0]
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+
+# name of the manifest in the target directory of the instances
+MANIFEST_NAME = "manifest.json"
+
+# needs to be increased whenever the computation of keys changes
+MANIFEST_VERSION = 1
+
+def file_digest(path):
+    '''
+    returns the SHA-256 hash of the content of a file
+
+    path - path to the file
+    '''
+
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+def source_version(modules):
+    '''
+    returns a hash identifying the version of the source code of modules
+
+    modules - list of modules, e.g., a generator and the modules it uses to write files
+    '''
+
+    digest = hashlib.sha256()
+
+    for module in sorted(modules, key=lambda module: module.__name__):
+        digest.update(module.__name__.encode())
+        digest.update(file_digest(module.__file__).encode())
+
+    return digest.hexdigest()
+
+def instance_key(version, family, parameters):
+    '''
+    returns the key of an instance, i.e., a hash of everything its file depends on
+
+    version    - version of the source code of the generator, see source_version
+    family     - family of the instance, e.g., "elec" or "maxcut"
+    parameters - dictionary of all parameters of the instance that can be encoded as JSON, e.g., N, D,
+                 the variant of symmetry handling, the compression, or the digest of a graph file
+    '''
+
+    text = json.dumps([MANIFEST_VERSION, version, family, parameters], sort_keys=True)
+
+    return hashlib.sha256(text.encode()).hexdigest()
+
+class Manifest:
+    '''
+    Manifest of the instances generated in a directory.
+
+    The manifest maps the label of each instance to its key and the name of its file.
+    An instance is up to date if its key did not change and its file still exists
+    with the recorded size, i.e., it has not been truncated by an interrupted run;
+    only instances that are not up to date need to be generated again. The manifest
+    is stored as JSON file MANIFEST_NAME in the directory of the instances.
+    '''
+
+    def __init__(self, directory):
+        '''
+        reads the manifest of a directory, which is empty if the directory does not contain a manifest
+
+        directory - target directory of the instances
+        '''
+
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self.entries = dict()
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+
+    def is_current(self, label, key):
+        '''
+        returns whether an instance with a given key has been generated and its file still exists with the recorded size
+
+        label - label of the instance
+        key   - key of the instance, see instance_key
+        '''
+
+        entry = self.entries.get(label)
+        if entry is None or entry["key"] != key:
+            return False
+
+        path = os.path.join(self.directory, entry["file"])
+
+        return os.path.isfile(path) and os.path.getsize(path) == entry.get("size")
+
+    def record(self, label, key, filename):
+        '''
+        records that an instance has been generated
+
+        label    - label of the instance
+        key      - key of the instance, see instance_key
+        filename - path to the generated file
+        '''
+
+        self.entries[label] = {"key": key, "file": os.path.relpath(filename, self.directory),
+                               "size": os.path.getsize(filename)}
+
+    def save(self):
+        '''
+        writes the manifest to its file, which is replaced atomically
+        '''
+
+        tmpname = self.path + ".tmp"
+        with open(tmpname, 'w') as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmpname, self.path)
@@ -0,0 +1,123 @@
+import math
+import cip_writer as cw
+
+# maximal number of terms per line of an LP file
+TERMS_PER_LINE = 8
+
+# LP files only support binary, integer, and continuous variables
+GENERALS = ["integer", "implicit"]
+
+def format_term(coef, monomial):
+    '''
+    returns a term of a linear or quadratic expression in LP format, e.g., "- 2 x * y"
+
+    coef     - coefficient of the term
+    monomial - tuple of names of the variables of the term
+    '''
+
+    variables = " * ".join(monomial) if len(monomial) < 2 or monomial[0] != monomial[1] else f"{monomial[0]} ^ 2"
+    sign = "-" if coef < 0 else "+"
+
+    if abs(coef) == 1:
+        return f"{sign} {variables}"
+
+    return f"{sign} {cw.format_number(abs(coef))} {variables}"
+
+def wrap_terms(terms):
+    '''
+    returns terms joined to lines of at most TERMS_PER_LINE terms
+
+    terms - list of terms in LP format
+    '''
+
+    return "\n   ".join(" ".join(terms[k:k+TERMS_PER_LINE]) for k in range(0, len(terms), TERMS_PER_LINE))
+
+def constraint_text(cons):
+    '''
+    returns the text defining a constraint of a model.Model in LP format
+
+    Raises ValueError if the constraint is neither linear nor quadratic or if it has
+    two different finite sides.
+
+    cons - the constraint
+    '''
+
+    terms = cons.linear_terms()
+    if terms is not None:
+        constant = 0
+        linear = [format_term(coef, (var,)) for (coef, var) in terms]
+        quadratic = []
+    else:
+        poly = cons.expression.polynomial()
+        if poly is None or any(len(monomial) > 2 for monomial in poly):
+            raise ValueError(f"constraint <{cons.name}> is not quadratic and cannot be written in LP format")
+
+        constant = poly.pop((), 0)
+        linear = [format_term(coef, monomial) for (monomial, coef) in poly.items() if len(monomial) == 1 and coef != 0]
+        quadratic = [format_term(coef, monomial) for (monomial, coef) in poly.items() if len(monomial) == 2 and coef != 0]
+
+    if cons.lhs == cons.rhs:
+        (sense, side) = ("=", cons.rhs)
+    elif cons.lhs == -math.inf:
+        (sense, side) = ("<=", cons.rhs)
+    elif cons.rhs == math.inf:
+        (sense, side) = (">=", cons.lhs)
+    else:
+        raise ValueError(f"constraint <{cons.name}> is ranged and cannot be written in LP format")
+
+    expression = wrap_terms(linear)
+    if quadratic:
+        expression = (expression + " " if expression else "") + f"+ [ {wrap_terms(quadratic)} ]"
+
+    return f" {cons.name}: {expression} {sense} {cw.format_number(side - constant)}"
+
+def bound_line(var):
+    '''
+    returns the line defining the bounds of a variable in LP format
+
+    var - variable of a model.Model
+    '''
+
+    if var.lb == -math.inf and var.ub == math.inf:
+        return f" {var.name} free"
+    elif var.lb == var.ub:
+        return f" {var.name} = {cw.format_number(var.lb)}"
+
+    return f" {cw.format_number(var.lb)} <= {var.name} <= {cw.format_number(var.ub)}"
+
+def write_lp(model, lp):
+    '''
+    writes a model.Model in LP format
+
+    Only models with linear objective and linear or quadratic constraints can be written,
+    otherwise ValueError is raised.
+
+    model - the model
+    lp    - CIPWriter to which the model is written
+    '''
+
+    objective = [format_term(var.obj, (var.name,)) for var in model.variables if var.obj != 0]
+
+    lp.write_lines([
+        f"\\ Problem name: {model.name}",
+        "Maximize" if model.sense == "maximize" else "Minimize",
+        f" obj: {wrap_terms(objective)}",
+        "Subject To"
+        ])
+
+    for block in model.blocks:
+        cw.write_section(lp, model, ("lp", block), lambda: block.lines(constraint_text))
+
+    # bounds of binary variables are implied by their section
+    cw.write_section(lp, model, ("lp", "bounds"),
+                     lambda: ["Bounds"] + [bound_line(var) for var in model.variables if var.vartype != "binary"])
+
+    binaries = [var.name for var in model.variables if var.vartype == "binary"]
+    if binaries:
+        lp.write_lines(["Binaries", wrap_terms(binaries)])
+
+    generals = [var.name for var in model.variables if var.vartype in GENERALS]
+    if generals:
+        lp.write_lines(["Generals", wrap_terms(generals)])
+
+    lp.write("End\n")
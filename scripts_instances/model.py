@@ -0,0 +1,591 @@
+import math
+import os
+import cip_writer as cw
+import lp_writer as lw
+import osil_writer as ow
+
+# supported file formats, their endings, and the functions writing a model to a CIPWriter
+FORMATS = {
+    "cip": (".cip", cw.write_cip),
+    "osil": (".osil", ow.write_osil),
+    "lp": (".lp", lw.write_lp)
+}
+
+# Expressions of nonlinear constraints are trees of the classes Var, Sum, Product, Power,
+# Quotient, and Abs. Each expression provides its text in CIP format by cip(), its text
+# in OSnL, the expression format of OSiL, by osnl(index) for a dictionary index mapping
+# names of variables to their indices, and its expansion to a polynomial by polynomial(),
+# which is None if the expression is no polynomial, see multiply_polynomials.
+
+class Var:
+    '''
+    Expression consisting of a single variable.
+    '''
+
+    __slots__ = ["name"]
+
+    def __init__(self, name):
+        '''
+        initializes the expression
+
+        name - name of the variable
+        '''
+
+        self.name = name
+
+    def cip(self):
+        return f"<{self.name}>"
+
+    def osnl(self, index):
+        return f'<variable idx="{index[self.name]}"/>'
+
+    def polynomial(self):
+        return {(self.name,): 1}
+
+class Sum:
+    '''
+    Expression constant + sum_k coef_k * expr_k.
+    '''
+
+    __slots__ = ["terms", "constant"]
+
+    def __init__(self, terms, constant=0):
+        '''
+        initializes the expression
+
+        terms    - list of pairs (coefficient, expression)
+        constant - constant added to the terms
+        '''
+
+        self.terms = terms
+        self.constant = constant
+
+    def cip(self):
+        pieces = []
+        if self.constant != 0:
+            pieces.append(cw.format_number(self.constant))
+
+        for (coef, expr) in self.terms:
+            text = expr.cip() if not isinstance(expr, Sum) else f"({expr.cip()})"
+            if abs(coef) != 1:
+                # coefficients become the first factor of products
+                separator = " * " if isinstance(expr, Product) else "*"
+                text = f"{cw.format_number(abs(coef))}{separator}{text}"
+
+            if not pieces:
+                pieces.append(text if coef > 0 else f"-{text}")
+            else:
+                pieces.append(f" + {text}" if coef > 0 else f" - {text}")
+
+        return "".join(pieces) if pieces else "0"
+
+    def osnl(self, index):
+        children = [] if self.constant == 0 else [f'<number value="{cw.format_number(self.constant)}"/>']
+
+        for (coef, expr) in self.terms:
+            if coef == 1:
+                children.append(expr.osnl(index))
+            else:
+                children.append(f'<times><number value="{cw.format_number(coef)}"/>{expr.osnl(index)}</times>')
+
+        if len(children) == 1:
+            return children[0]
+
+        return "<sum>" + "".join(children) + "</sum>"
+
+    def polynomial(self):
+        result = {(): self.constant} if self.constant != 0 else dict()
+
+        for (coef, expr) in self.terms:
+            poly = expr.polynomial()
+            if poly is None:
+                return None
+            for (monomial, value) in poly.items():
+                result[monomial] = result.get(monomial, 0) + coef * value
+
+        return result
+
+class Product:
+    '''
+    Expression prod_k expr_k.
+    '''
+
+    __slots__ = ["factors"]
+
+    def __init__(self, factors):
+        '''
+        initializes the expression
+
+        factors - list of expressions
+        '''
+
+        self.factors = factors
+
+    def cip(self):
+        return " * ".join(factor.cip() if not isinstance(factor, Sum) else f"({factor.cip()})" for factor in self.factors)
+
+    def osnl(self, index):
+        return "<product>" + "".join(factor.osnl(index) for factor in self.factors) + "</product>"
+
+    def polynomial(self):
+        result = {(): 1}
+
+        for factor in self.factors:
+            poly = factor.polynomial()
+            if poly is None:
+                return None
+            result = multiply_polynomials(result, poly)
+
+        return result
+
+class Power:
+    '''
+    Expression base^exponent.
+    '''
+
+    __slots__ = ["base", "exponent"]
+
+    def __init__(self, base, exponent):
+        '''
+        initializes the expression
+
+        base     - expression
+        exponent - number
+        '''
+
+        self.base = base
+        self.exponent = exponent
+
+    def cip(self):
+        base = self.base.cip() if isinstance(self.base, (Var, Abs)) else f"({self.base.cip()})"
+
+        if float(self.exponent).is_integer() and self.exponent >= 0:
+            return f"{base}^{cw.format_number(self.exponent)}"
+
+        return f"{base}^({cw.format_number(self.exponent)})"
+
+    def osnl(self, index):
+        if self.exponent == 2:
+            return f"<square>{self.base.osnl(index)}</square>"
+        elif self.exponent == 0.5:
+            return f"<sqrt>{self.base.osnl(index)}</sqrt>"
+
+        return f'<power>{self.base.osnl(index)}<number value="{cw.format_number(self.exponent)}"/></power>'
+
+    def polynomial(self):
+        if not float(self.exponent).is_integer() or self.exponent < 0:
+            return None
+
+        poly = self.base.polynomial()
+        if poly is None:
+            return None
+
+        result = {(): 1}
+        for _ in range(int(self.exponent)):
+            result = multiply_polynomials(result, poly)
+
+        return result
+
+class Quotient:
+    '''
+    Expression numerator / expr for a constant numerator.
+    '''
+
+    __slots__ = ["numerator", "denominator"]
+
+    def __init__(self, numerator, denominator):
+        '''
+        initializes the expression
+
+        numerator   - number
+        denominator - expression
+        '''
+
+        self.numerator = numerator
+        self.denominator = denominator
+
+    def cip(self):
+        denominator = self.denominator.cip()
+        if not isinstance(self.denominator, (Var, Power, Abs)):
+            denominator = f"({denominator})"
+
+        return f"{cw.format_number(self.numerator)}/{denominator}"
+
+    def osnl(self, index):
+        return f'<divide><number value="{cw.format_number(self.numerator)}"/>{self.denominator.osnl(index)}</divide>'
+
+    def polynomial(self):
+        return None
+
+class Abs:
+    '''
+    Expression |expr|.
+    '''
+
+    __slots__ = ["argument"]
+
+    def __init__(self, argument):
+        '''
+        initializes the expression
+
+        argument - expression
+        '''
+
+        self.argument = argument
+
+    def cip(self):
+        return f"abs({self.argument.cip()})"
+
+    def osnl(self, index):
+        return f"<abs>{self.argument.osnl(index)}</abs>"
+
+    def polynomial(self):
+        return None
+
+def multiply_polynomials(first, second):
+    '''
+    returns the product of two polynomials
+
+    Polynomials are dictionaries mapping monomials, i.e., sorted tuples of names of
+    variables, to their coefficients.
+
+    first  - polynomial
+    second - polynomial
+    '''
+
+    result = dict()
+
+    for (monomial1, coef1) in first.items():
+        for (monomial2, coef2) in second.items():
+            monomial = tuple(sorted(monomial1 + monomial2))
+            result[monomial] = result.get(monomial, 0) + coef1 * coef2
+
+    return result
+
+class Constraint:
+    '''
+    Nonlinear constraint lhs <= expression <= rhs.
+    '''
+
+    __slots__ = ["name", "expression", "lhs", "rhs"]
+
+    def __init__(self, name, expression, lhs=-math.inf, rhs=math.inf):
+        '''
+        initializes the constraint
+
+        name       - name of the constraint
+        expression - expression of the constraint
+        lhs        - left-hand side (-math.inf if the constraint has no left-hand side)
+        rhs        - right-hand side (math.inf if the constraint has no right-hand side)
+        '''
+
+        self.name = name
+        self.expression = expression
+        self.lhs = lhs
+        self.rhs = rhs
+
+    def linear_terms(self):
+        '''
+        returns None since the constraint is not linear
+        '''
+
+        return None
+
+    def cip(self):
+        '''
+        returns the expression of the constraint in CIP format
+        '''
+
+        return self.expression.cip()
+
+class LinearConstraint:
+    '''
+    Linear constraint lhs <= sum_k coef_k * x_k <= rhs.
+
+    The terms are stored as pairs of numbers and names of variables instead of
+    expressions, since models can contain millions of linear constraints.
+    '''
+
+    __slots__ = ["name", "terms", "lhs", "rhs"]
+
+    def __init__(self, name, terms, lhs=-math.inf, rhs=math.inf):
+        '''
+        initializes the constraint
+
+        name  - name of the constraint
+        terms - list of pairs (coefficient, name of variable)
+        lhs   - left-hand side (-math.inf if the constraint has no left-hand side)
+        rhs   - right-hand side (math.inf if the constraint has no right-hand side)
+        '''
+
+        self.name = name
+        self.terms = terms
+        self.lhs = lhs
+        self.rhs = rhs
+
+    @property
+    def expression(self):
+        return Sum([(coef, Var(var)) for (coef, var) in self.terms])
+
+    def linear_terms(self):
+        '''
+        returns the list of pairs (coefficient, name of variable)
+        '''
+
+        return self.terms
+
+    def cip(self):
+        '''
+        returns the expression of the constraint in CIP format
+        '''
+
+        text = " ".join([f"+ <{var}>" if coef == 1 else f"- <{var}>" if coef == -1
+                         else f"{'+' if coef > 0 else '-'} {cw.format_number(abs(coef))}*<{var}>"
+                         for (coef, var) in self.terms])
+
+        return text[2:] if text.startswith("+") else "-" + text[2:]
+
+class Variable:
+    '''
+    Variable of a model.
+    '''
+
+    __slots__ = ["name", "vartype", "lb", "ub", "obj"]
+
+    def __init__(self, name, vartype, lb, ub, obj):
+        '''
+        initializes the variable
+
+        name    - name of the variable
+        vartype - type of the variable, i.e., "continuous", "binary", "integer", or "implicit"
+        lb      - lower bound (-math.inf if the variable is unbounded from below)
+        ub      - upper bound (math.inf if the variable is unbounded from above)
+        obj     - objective coefficient
+        '''
+
+        self.name = name
+        self.vartype = vartype
+        self.lb = lb
+        self.ub = ub
+        self.obj = obj
+
+class ConstraintBlock:
+    '''
+    List of constraints of a model.
+    '''
+
+    def __init__(self, constraints):
+        '''
+        initializes the block
+
+        constraints - list of constraints
+        '''
+
+        self.constraints = constraints
+
+    def __len__(self):
+        return len(self.constraints)
+
+    def __iter__(self):
+        return iter(self.constraints)
+
+    def lines(self, render):
+        '''
+        generator of the text of all constraints of the block in a file format
+
+        render - function returning the text of a constraint
+        '''
+
+        for cons in self.constraints:
+            yield render(cons)
+
+class LinearBlock:
+    '''
+    Block of linear constraints that follow the same patterns for each row of variables.
+
+    Each pattern defines a linear constraint for every row, whose variables are the
+    entries of the row, e.g., the two inequalities of each edge of a max-cut problem.
+    Instead of creating and rendering each constraint, a pattern is rendered once
+    with placeholders for the variables, which are filled in for each row. The
+    constraints are only created when the block is iterated.
+    '''
+
+    def __init__(self, patterns, rows):
+        '''
+        initializes the block
+
+        patterns - list of tuples (name, coefficients, lhs, rhs), where name is a format string in which {0} is
+                   replaced by the index of the row and coefficients is the list of coefficients of the row entries
+        rows     - list of tuples of names of variables
+        '''
+
+        self.patterns = patterns
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.patterns) * len(self.rows)
+
+    def __iter__(self):
+        for (index, row) in enumerate(self.rows):
+            for (name, coefs, lhs, rhs) in self.patterns:
+                yield LinearConstraint(name.format(index), list(zip(coefs, row)), lhs, rhs)
+
+    def lines(self, render):
+        '''
+        generator of the text of all constraints of the block in a file format
+
+        render - function returning the text of a constraint, it must not modify names of variables and constraints
+        '''
+
+        # the placeholder {k+1} is the name of the k-th variable of a row
+        template = "\n".join(render(LinearConstraint(name, [(coef, f"{{{k+1}}}") for (k, coef) in enumerate(coefs)],
+                                                     lhs, rhs))
+                             for (name, coefs, lhs, rhs) in self.patterns)
+
+        for (index, row) in enumerate(self.rows):
+            yield template.format(index, *row)
+
+class Model:
+    '''
+    Representation of an optimization problem that can be written in several file formats.
+
+    A model consists of variables with linear objective coefficients and of blocks of
+    constraints. Since the sizes of all blocks are known, the numbers of variables and
+    constraints are exact before the model is written.
+
+    Models of several variants of a problem, e.g., with different symmetry handling
+    inequalities, can share their variables and blocks of constraints by variant().
+    Shared parts are then rendered only once per file format.
+    '''
+
+    def __init__(self, name, sense):
+        '''
+        initializes an empty model
+
+        name  - name of the problem
+        sense - objective sense, i.e., "minimize" or "maximize"
+        '''
+
+        self.name = name
+        self.sense = sense
+        self.variables = []
+        self.blocks = []
+        self.cache = None
+
+    def add_variable(self, name, vartype="continuous", lb=0, ub=math.inf, obj=0):
+        '''
+        adds a variable to the model
+
+        name    - name of the variable
+        vartype - type of the variable, i.e., "continuous", "binary", "integer", or "implicit"
+        lb      - lower bound (-math.inf if the variable is unbounded from below)
+        ub      - upper bound (math.inf if the variable is unbounded from above)
+        obj     - objective coefficient
+        '''
+
+        self.variables.append(Variable(name, vartype, lb, ub, obj))
+
+    def add_constraints(self, constraints):
+        '''
+        adds a block of constraints to the model
+
+        constraints - list of constraints
+        '''
+
+        self.blocks.append(ConstraintBlock(constraints))
+
+    def add_linear_block(self, patterns, rows):
+        '''
+        adds a block of linear constraints following patterns to the model, see LinearBlock
+
+        patterns - list of tuples (name, coefficients, lhs, rhs) of the patterns
+        rows     - list of tuples of names of variables
+        '''
+
+        self.blocks.append(LinearBlock(patterns, rows))
+
+    def variant(self, name, constraints):
+        '''
+        returns a model sharing the variables and constraints of this model, extended by further constraints
+
+        name        - name of the problem of the variant
+        constraints - list of constraints added to the variant
+        '''
+
+        if self.cache is None:
+            self.cache = dict()
+
+        model = Model(name, self.sense)
+        model.variables = self.variables
+        model.blocks = self.blocks + [ConstraintBlock(constraints)]
+        model.cache = self.cache
+
+        return model
+
+    def nvars(self, vartype=None):
+        '''
+        returns the number of variables, possibly of a given type
+
+        vartype - type of the counted variables (None if all variables shall be counted)
+        '''
+
+        if vartype is None:
+            return len(self.variables)
+
+        return sum(1 for var in self.variables if var.vartype == vartype)
+
+    def nconss(self):
+        '''
+        returns the number of constraints
+        '''
+
+        return sum(len(block) for block in self.blocks)
+
+    def constraints(self):
+        '''
+        generator of all constraints of the model
+        '''
+
+        for block in self.blocks:
+            yield from block
+
+    def rendered(self, key, render):
+        '''
+        returns the text of a part of the model, which is cached if the part is shared by several models
+
+        key    - key identifying the part and the format, e.g., ("cip", block)
+        render - function without arguments returning the text
+        '''
+
+        if self.cache is None:
+            return render()
+
+        if key not in self.cache:
+            self.cache[key] = render()
+
+        return self.cache[key]
+
+def write_model(model, name, fileformat="cip", compression=None, solver=None):
+    '''
+    writes a model to a file and returns the name of the created file
+
+    model       - the model
+    name        - path to the file without ending, the ending of the format is appended
+    fileformat  - format of the file, i.e., a key of FORMATS
+    compression - compression of the file, see cip_writer.CIPWriter (None if the file shall not be compressed)
+    solver      - command of a solver reading the model instead of a file, see cip_writer.CIPWriter
+    '''
+
+    (ending, write) = FORMATS[fileformat]
+
+    with cw.CIPWriter(name + ending, compression=compression, solver=solver) as out:
+        try:
+            write(model, out)
+        except ValueError:
+            # do not leave a truncated file, e.g., if the model cannot be expressed in the format
+            out.close()
+            if solver is None:
+                os.remove(out.name)
+            raise
+
+    return out.name
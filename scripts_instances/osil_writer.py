@@ -0,0 +1,115 @@
+import math
+from array import array
+import cip_writer as cw
+from xml.sax.saxutils import quoteattr
+
+# types of variables in OSiL
+VARIABLE_TYPES = {"continuous": "C", "binary": "B", "integer": "I", "implicit": "C"}
+
+def format_bound(value):
+    '''
+    returns the representation of a bound in OSiL
+
+    value - the bound
+    '''
+
+    if math.isinf(value):
+        return "INF" if value > 0 else "-INF"
+
+    return cw.format_number(value)
+
+def variable_line(var):
+    '''
+    returns the line defining a variable in OSiL
+
+    var - variable of a model.Model
+    '''
+
+    return (f'   <var name={quoteattr(var.name)} type="{VARIABLE_TYPES[var.vartype]}" lb="{format_bound(var.lb)}"'
+            f' ub="{format_bound(var.ub)}"/>')
+
+def constraint_line(cons):
+    '''
+    returns the line defining the sides of a constraint in OSiL
+
+    cons - constraint of a model.Model
+    '''
+
+    sides = "".join(f' {side}="{format_bound(value)}"' for (side, value) in [("lb", cons.lhs), ("ub", cons.rhs)]
+                    if not math.isinf(value))
+
+    return f"   <con name={quoteattr(cons.name)}{sides}/>"
+
+def write_osil(model, osil):
+    '''
+    writes a model.Model in OSiL format
+
+    The coefficients of linear constraints are stored row-wise in the section
+    linearConstraintCoefficients, all other constraints are stored as expression
+    trees in the section nonlinearExpressions.
+
+    model - the model
+    osil  - CIPWriter to which the model is written
+    '''
+
+    index = {var.name: i for (i, var) in enumerate(model.variables)}
+    nconss = model.nconss()
+
+    osil.write_lines([
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<osil xmlns="os.optimizationservices.org">',
+        " <instanceHeader>",
+        f"  <name>{model.name}</name>",
+        " </instanceHeader>",
+        " <instanceData>",
+        f'  <variables numberOfVariables="{model.nvars()}">'
+        ])
+    cw.write_section(osil, model, ("osil", "variables"), lambda: (variable_line(var) for var in model.variables))
+
+    objective = [f'   <coef idx="{index[var.name]}">{cw.format_number(var.obj)}</coef>'
+                 for var in model.variables if var.obj != 0]
+    osil.write_lines([
+        "  </variables>",
+        '  <objectives numberOfObjectives="1">',
+        f'   <obj maxOrMin="{"max" if model.sense == "maximize" else "min"}" numberOfObjCoef="{len(objective)}">',
+        *objective,
+        "   </obj>",
+        "  </objectives>",
+        f'  <constraints numberOfConstraints="{nconss}">'
+        ])
+    for block in model.blocks:
+        cw.write_section(osil, model, ("osil", block), lambda: block.lines(constraint_line))
+    osil.write_lines(["  </constraints>"])
+
+    # collect the coefficients of linear constraints row-wise and the rows of nonlinear constraints
+    starts = array("q", [0])
+    colidx = array("q")
+    values = array("d")
+    nonlinear = []
+    for (row, cons) in enumerate(model.constraints()):
+        terms = cons.linear_terms()
+        if terms is None:
+            nonlinear.append(row)
+        else:
+            colidx.extend(index[var] for (coef, var) in terms)
+            values.extend(coef for (coef, var) in terms)
+        starts.append(len(colidx))
+
+    if colidx:
+        osil.write_lines([f'  <linearConstraintCoefficients numberOfValues="{len(colidx)}">', "   <start>"])
+        osil.write_lines(f"    <el>{start}</el>" for start in starts)
+        osil.write_lines(["   </start>", "   <colIdx>"])
+        osil.write_lines(f"    <el>{idx}</el>" for idx in colidx)
+        osil.write_lines(["   </colIdx>", "   <value>"])
+        formatted = {value: cw.format_number(value) for value in set(values)}
+        osil.write_lines(f"    <el>{formatted[value]}</el>" for value in values)
+        osil.write_lines(["   </value>", "  </linearConstraintCoefficients>"])
+
+    if nonlinear:
+        rows = set(nonlinear)
+        osil.write_lines([f'  <nonlinearExpressions numberOfNonlinearExpressions="{len(nonlinear)}">'])
+        osil.write_lines(f'   <nl idx="{row}">{cons.expression.osnl(index)}</nl>'
+                         for (row, cons) in enumerate(model.constraints()) if row in rows)
+        osil.write_lines(["  </nonlinearExpressions>"])
+
+    osil.write_lines([" </instanceData>", "</osil>"])
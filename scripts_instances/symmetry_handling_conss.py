@@ -1,40 +1,42 @@
 import math
+import model as md
 
-def matrix_sort_first_row(cip, mat_vars, nrows, ncols, row_is_nonnegative):
+# variants of symmetry handling inequalities, see symmetry_handling_conss
+SYMMETRY_METHODS = list(range(7))
+
+def matrix_sort_first_row(mat_vars, nrows, ncols, row_is_nonnegative):
     '''
-    Given a matrix of variables, adds the inequalities
-    x_{1,1} >= x_{1,2} >= ... >= x_{1,n}
-    to a CIP file.
+    Given a matrix of variables, returns the list of inequalities
+    x_{1,1} >= x_{1,2} >= ... >= x_{1,n}.
 
-    cip                - write stream to CIP file to which inequalities are added
     mat_vars           - dictionary mapping matrix indices to the corresponding variable names
     nrows              - number of rows of matrix
     ncols              - number of columns of matrix
     row_is_nonnegative - whether the variables of the first row are assumed to be non-negative
     '''
 
-    for j in range(ncols - 1):
-        cip.write(f"  [linear] <sort_first_row{j}>: -<{mat_vars[0,j]}> + <{mat_vars[0,j+1]}> <= 0;\n")
+    conss = [md.LinearConstraint(f"sort_first_row{j}", [(-1, mat_vars[0,j]), (1, mat_vars[0,j+1])], rhs=0)
+             for j in range(ncols - 1)]
 
     if row_is_nonnegative:
-        cip.write(f"  [linear] <first_row_nonnegative>: -<{mat_vars[0,ncols-1]}> <= 0;\n")
+        conss.append(md.LinearConstraint("first_row_nonnegative", [(-1, mat_vars[0,ncols-1])], rhs=0))
+
+    return conss
 
-def matrix_sort_first_column(cip, mat_vars, nrows, ncols):
+def matrix_sort_first_column(mat_vars, nrows, ncols):
     '''
-    Given a matrix of variables, adds the inequalities
-    x_{1,1} >= x_{2,1} >= ... >= x_{m,1}
-    to a CIP file.
+    Given a matrix of variables, returns the list of inequalities
+    x_{1,1} >= x_{2,1} >= ... >= x_{m,1}.
 
-    cip      - write stream to CIP file to which inequalities are added
     mat_vars - dictionary mapping matrix indices to the corresponding variable names
     nrows    - number of rows of matrix
     ncols    - number of columns of matrix
     '''
 
-    for i in range(nrows - 1):
-        cip.write(f"  [linear] <sort_first_column{i}>: -<{mat_vars[i,0]}> + <{mat_vars[i+1,0]}> <= 0;\n")
+    return [md.LinearConstraint(f"sort_first_column{i}", [(-1, mat_vars[i,0]), (1, mat_vars[i+1,0])], rhs=0)
+            for i in range(nrows - 1)]
 
-def double_lex_reflection_matrix(cip, mat_vars, nrows, ncols, enforce_sorting):
+def double_lex_reflection_matrix(mat_vars, nrows, ncols, enforce_sorting):
     '''
     Given a matrix whose rows and columns can be permuted arbitrarily and whose column entries can be reflected,
     iteratively adds the following inequalities. If column i has k active rows, then it enforces that the ceil(k/2)
@@ -44,40 +46,42 @@ def double_lex_reflection_matrix(cip, mat_vars, nrows, ncols, enforce_sorting):
 
     If enforce_sorting is true, it furthermore ensures that the entries ceil(k/2)+1,...,k in column 1 are sorted.
 
-    The corresponding inequalities are written to a CIP file.
+    Returns the list of the corresponding inequalities.
 
-    cip             - write stream to CIP file to which inequalities are added
     mat_vars        - dictionary mapping matrix indices to the corresponding variable names
     nrows           - number of rows of matrix
     ncols           - number of columns of matrix
     enforce_sorting - whether sorting shall be enforced
     '''
 
+    conss = []
     nsymrows = math.ceil(nrows/2)
     ub = nrows
     for j in range(ncols):
         # the first nsymrows rows have a nonnegative entry in column j
         for i in range(nsymrows):
-            cip.write(f"  [linear] <doublelex_nonnegative_col{j}_row{i}>: -<{mat_vars[i,j]}> <= 0;\n")
+            conss.append(md.LinearConstraint(f"doublelex_nonnegative_col{j}_row{i}", [(-1, mat_vars[i,j])], rhs=0))
 
         # possible sort some entries in column j no covered by previous constraint
         if enforce_sorting:
             for i in range(nsymrows, ub-1):
-                cip.write(f"  [linear] <doublelex_sort_row{i}>: -<{mat_vars[i,0]}> + <{mat_vars[i+1,0]}> <= 0;\n")
+                conss.append(md.LinearConstraint(f"doublelex_sort_row{i}", [(-1, mat_vars[i,0]), (1, mat_vars[i+1,0])],
+                                                 rhs=0))
         ub = nsymrows
         nsymrows = math.ceil(nsymrows/2)
 
     # also sort elements in last group
     if enforce_sorting:
         for i in range(nsymrows - 1):
-            cip.write(f"  [linear] <doublelex_sort_row{i}>: -<{mat_vars[i,0]}> + <{mat_vars[i+1,0]}> <= 0;\n")
+            conss.append(md.LinearConstraint(f"doublelex_sort_row{i}", [(-1, mat_vars[i,0]), (1, mat_vars[i+1,0])], rhs=0))
+
+    return conss
     
 
-def add_symmetry_handling_conss(cip, mat_vars, nrows, ncols, variant):
+def symmetry_handling_conss(mat_vars, nrows, ncols, variant):
     '''
-    Adds symmetry handling inequalities for matrix symmetries to a CIP file.
+    Returns the list of symmetry handling inequalities for matrix symmetries.
 
-    cip      - write stream to CIP file to which inequalities are added
     mat_vars - dictionary mapping matrix indices to the corresponding variable names
     nrows    - number of rows of matrix
     ncols    - number of columns of matrix
@@ -92,32 +96,20 @@ def add_symmetry_handling_conss(cip, mat_vars, nrows, ncols, variant):
     '''
 
     if variant == 1:
-        matrix_sort_first_row(cip, mat_vars, nrows, ncols, False)
+        return matrix_sort_first_row(mat_vars, nrows, ncols, False)
     elif variant == 2:
-        matrix_sort_first_row(cip, mat_vars, nrows, ncols, True)
+        return matrix_sort_first_row(mat_vars, nrows, ncols, True)
     elif variant == 3:
-        matrix_sort_first_row(cip, mat_vars, nrows, ncols, True)
-        matrix_sort_first_column(cip, mat_vars, nrows, ncols)
+        return matrix_sort_first_row(mat_vars, nrows, ncols, True) + matrix_sort_first_column(mat_vars, nrows, ncols)
     elif variant == 4:
-        double_lex_reflection_matrix(cip, mat_vars, nrows, ncols, False)
+        return double_lex_reflection_matrix(mat_vars, nrows, ncols, False)
     elif variant == 5:
-        double_lex_reflection_matrix(cip, mat_vars, nrows, ncols, True)
+        return double_lex_reflection_matrix(mat_vars, nrows, ncols, True)
     elif variant == 6:
-        double_lex_reflection_matrix(cip, mat_vars, nrows, ncols, True)
-        matrix_sort_first_row(cip, mat_vars, nrows, ncols, False)
+        return (double_lex_reflection_matrix(mat_vars, nrows, ncols, True)
+                + matrix_sort_first_row(mat_vars, nrows, ncols, False))
     elif variant == 0:
-        pass
+        return []
     else:
         print(f"Expected variant to be an integer between 0 and 6, but received {variant}.")
         assert False
-
-def ub_number_conss(nrows, ncols):
-    '''
-    returns an upper bound on the number of symmetry handling constraints that can
-    be generated to handle symmetries of a matrix
-
-    nrows - number of rows of matrix
-    ncols - number of columns of matrix
-    '''
-
-    return 2*(nrows*ncols + 1) + ncols
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+
+# stub of the SCIP binary whose behavior is chosen by the name of the instance:
+# instances containing "hang" exceed every time limit, instances containing "crash"
+# terminate with a nonzero exit code, all other instances are solved
+
+import re
+import sys
+import time
+
+commands = sys.argv[sys.argv.index("-c") + 1]
+
+print("SCIP version 9.0.0 [precision: 8 byte]")
+seed = re.search(r"set randomization permutationseed (\d+)", commands)
+if seed is not None:
+    print(f"randomization/permutationseed = {seed.group(1)}")
+sys.stdout.flush()
+
+if "hang" in commands:
+    time.sleep(60)
+if "crash" in commands:
+    sys.exit(7)
+
+print("SCIP Status        : problem is solved [optimal solution found]")
+print("Solving Time (sec) : 1.50")
+print("Gap                : 0.00 %")
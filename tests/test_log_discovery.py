@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_experiments"))
+
+import log_discovery
+import records
+
+BASE = "check.packing_sym0.scip-10.0.0.linux.x86_64.gnu.opt.spx2.moskito.sym_1_doublelex_1_reflection_1_simple_1"
+
+def touch(directory, filename):
+    with open(os.path.join(directory, filename), 'w'):
+        pass
+
+def test_records_file_is_discovered(tmp_path):
+    touch(tmp_path, BASE + records.RECORDS_ENDING)
+
+    paths = log_discovery.LogIndex(str(tmp_path)).find_logs("packing_sym0", "sym_1_doublelex_1_reflection_1_simple_1")
+
+    assert [os.path.basename(path) for path in paths] == [BASE + records.RECORDS_ENDING]
+    assert log_discovery.parse_log_name(BASE + records.RECORDS_ENDING)["host"] == "moskito"
+
+def test_log_is_preferred_over_records_file(tmp_path):
+    touch(tmp_path, BASE + records.RECORDS_ENDING)
+    touch(tmp_path, BASE + ".out.gz")
+
+    entries = log_discovery.LogIndex(str(tmp_path)).select(testset="packing_sym0")
+
+    assert [os.path.basename(entry["path"]) for entry in entries] == [BASE + ".out.gz"]
@@ -0,0 +1,63 @@
+import io
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_experiments"))
+
+import log_parser
+import run_experiments
+import run_journal
+
+STUB_SOLVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_solver.py")
+
+def run_and_parse(instance, timelim=100, seed=0):
+    '''
+    runs the stub solver on an instance and returns the log and the record parsed from it
+
+    instance - path to the instance, whose name determines the behavior of the stub solver
+    timelim  - time limit in seconds
+    seed     - seed of the permutation of the instance
+    '''
+
+    (output, (start, end)) = run_experiments.run_job(STUB_SOLVER, instance, None, timelim, 1000, seed)
+    log = io.StringIO()
+    run_experiments.write_block(log, instance, output, start, end)
+
+    records = list(log_parser.iterate_records(io.StringIO(log.getvalue()), timelim))
+    assert len(records) == 1
+
+    return log.getvalue(), records[0]
+
+def test_solved_run():
+    (log, record) = run_and_parse("instances/solved.cip", seed=3)
+
+    assert record.name == "solved.cip"
+    assert record.status == log_parser.SOLVED
+    assert record.time == 1.5
+    assert record.seed == 3
+    assert log_parser.FAILURE_PREFIX not in log
+
+def test_killed_run(monkeypatch):
+    monkeypatch.setattr(run_experiments, "hard_limits", lambda timelim, memlim: (1, memlim + 100))
+
+    (log, record) = run_and_parse("instances/hang.cip")
+
+    assert "hard time limit" in log
+    assert record.status == log_parser.FAILED
+    assert record.time == 100
+
+def test_crashed_run():
+    (log, record) = run_and_parse("instances/crash.cip")
+
+    assert "exit code 7" in log
+    assert record.status == log_parser.FAILED
+    assert record.time == 100
+
+@pytest.mark.parametrize("instance, completed", [("solved.cip", True), ("crash.cip", False)])
+def test_journal(tmp_path, instance, completed):
+    (log, _) = run_and_parse(f"instances/{instance}")
+    path = tmp_path / "check.out"
+    path.write_text(log)
+
+    assert run_journal.prepare_resume(str(path)) == ({(instance, 0)} if completed else set())